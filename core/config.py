@@ -31,6 +31,7 @@ class AraliaConfig(BaseSettings):
     # Execution Configuration
     max_retries: int = 3
     timeout_seconds: int = 30
+    exploration_limit: int = 1000
     temperature: float = 0.0
     verbose: bool = False
     
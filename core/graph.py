@@ -1,10 +1,12 @@
 """Main LangGraph implementation for Aralia OpenRAG."""
 
+import asyncio
+
 from langgraph.graph import StateGraph, END
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from .state import GraphState, create_initial_state
 from .config import AraliaConfig
@@ -139,7 +141,8 @@ class AraliaAssistantGraph:
             sso_url=request.get("sso_url", self.config.aralia_sso_url),
             stellar_url=request.get("stellar_url", self.config.aralia_stellar_url),
             client_id=request.get("client_id", self.config.aralia_client_id),
-            client_secret=request.get("client_secret", self.config.aralia_client_secret)
+            client_secret=request.get("client_secret", self.config.aralia_client_secret),
+            exploration_limit=self.config.exploration_limit
         )
         
         # Create initial state
@@ -193,6 +196,64 @@ class AraliaAssistantGraph:
             self.logger.error(f"Graph execution failed: {str(e)}", exc_info=True)
             raise
     
+    async def ainvoke(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute the graph asynchronously with the given request.
+        
+        State preparation authenticates against Aralia, so it runs in a
+        worker thread to keep the event loop free.
+        
+        Args:
+            request: Input request containing question and configuration
+            
+        Returns:
+            Graph execution result
+        """
+        try:
+            # Validate required fields
+            if "question" not in request:
+                raise ValueError("Missing required field: 'question'")
+            
+            # Prepare initial state
+            initial_state = await asyncio.to_thread(self._prepare_state, request)
+            
+            self.logger.info(f"Starting graph execution for question: {request['question']}")
+            
+            # Execute graph, releasing the request's async HTTP client afterwards
+            try:
+                result = await self.graph.ainvoke(initial_state)
+            finally:
+                await initial_state["at"].aclose()
+            
+            self.logger.info("Graph execution completed successfully")
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"Graph execution failed: {str(e)}", exc_info=True)
+            raise
+    
+    async def abatch(
+        self,
+        requests: List[Dict[str, Any]],
+        max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """Execute several requests concurrently.
+        
+        Args:
+            requests: Input requests, each as accepted by ``ainvoke``
+            max_concurrency: Maximum number of requests in flight, to respect
+                provider rate limits
+            
+        Returns:
+            Graph execution results in the same order as ``requests``
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(request: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.ainvoke(request)
+        
+        return await asyncio.gather(*(run(request) for request in requests))
+    
     def __call__(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Make the graph callable (legacy interface).
         
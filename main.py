@@ -5,13 +5,14 @@ This script demonstrates both the new refactored interface and maintains
 backward compatibility with the legacy interface.
 """
 
+import asyncio
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-def main():
+async def main():
     """Main execution function using the new interface."""
     from core.graph import AraliaAssistantGraph
     from core.config import AraliaConfig
@@ -40,24 +41,27 @@ def main():
         '如果酒駕車禍撞死人，會面臨哪些酒駕致死刑責?'
     ]
     
-    # Process the first question
-    question = questions[0]
+    # Process the first question; widen the slice to run more of them concurrently
+    selected = questions[:1]
     
     try:
         print("=== Using New Aralia OpenRAG Interface ===\n")
         
-        response = assistant_graph.invoke({
-            "question": question,
-            "ai": os.getenv("GEMINI_API_KEY"),  # API key for LLM
-            # Optional: override config settings
-            # "sso_url": "https://sso.araliadata.io",
-            # "stellar_url": "https://tw-air.araliadata.io",
-            # "interpretation_prompt": "Custom prompt for interpretation"
-        })
+        responses = await assistant_graph.abatch([
+            {
+                "question": question,
+                "ai": os.getenv("GEMINI_API_KEY"),  # API key for LLM
+                # Optional: override config settings
+                # "sso_url": "https://sso.araliadata.io",
+                # "stellar_url": "https://tw-air.araliadata.io",
+                # "interpretation_prompt": "Custom prompt for interpretation"
+            }
+            for question in selected
+        ])
         
     except Exception as e:
         print(f"Error: {str(e)}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
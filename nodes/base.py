@@ -1,7 +1,8 @@
 """Base node class for LangGraph nodes."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Union
+from langchain_core.messages import HumanMessage
 from core.state import GraphState
 from utils.logging import get_logger
 
@@ -34,6 +35,31 @@ class BaseNode(ABC):
         """
         pass
     
+    def build_cacheable_prompt(self, ai: Any, static_prefix: str, dynamic_tail: str) -> Union[str, List[HumanMessage]]:
+        """Build a prompt whose static prefix can be served from the provider's prompt cache.
+        
+        OpenAI and Gemini cache matching prefixes automatically, so a plain
+        string is enough; Anthropic needs an explicit cache breakpoint.
+        
+        Args:
+            ai: LLM instance the prompt will be sent to
+            static_prefix: Prompt text identical across calls
+            dynamic_tail: Prompt text specific to this call
+            
+        Returns:
+            Prompt string, or a message list with a cache breakpoint for Anthropic
+        """
+        # Compare by name so langchain_anthropic is not imported just for the check
+        if type(ai).__name__ != "ChatAnthropic":
+            return static_prefix + dynamic_tail
+        
+        return [
+            HumanMessage(content=[
+                {"type": "text", "text": static_prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": dynamic_tail}
+            ])
+        ]
+    
     def validate_input(self, state: GraphState) -> bool:
         """Validate input state for the node.
         
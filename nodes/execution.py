@@ -66,18 +66,20 @@ class FilterDecisionNode(BaseNode):
         Returns:
             State updates
         """
-        from schemas.prompts import PromptTemplates
+        from schemas.prompts import QUERY_GENERATION_PREFIX, render_query_generation_tail
         from schemas.models import QueryList
         
-        # Get filter options for each dataset
+        # Get filter options for each dataset not already prefetched during planning
+        prefetched = {item["id"] for item in state.get("filter_options") or []}
         for dataset in state['response']:
-            if 'filter' in dataset:
+            if 'filter' in dataset and dataset['id'] not in prefetched:
                 state["at"].get_filter_options(dataset['id'], dataset['sourceURL'], dataset['filter'])
 
-        prompt = PromptTemplates.QUERY_GENERATION.invoke({
-            "question": state['question'],
-            "response": state['response'],
-        })
+        prompt = self.build_cacheable_prompt(
+            state["ai"],
+            QUERY_GENERATION_PREFIX,
+            render_query_generation_tail(state['question'], str(state['response']))
+        )
 
         structured_llm = state["ai"].with_structured_output(QueryList)
 
@@ -4,9 +4,14 @@ from typing import Dict, Any
 from .base import BaseNode
 from core.state import GraphState
 from schemas.prompts import PromptTemplates
+from utils.cache import SemanticCache
 from utils.decorators import node_with_error_handling
 
 
+# Final answers shared across requests, keyed by question and retrieved data
+_INTERPRETATION_CACHE = SemanticCache("interpretation")
+
+
 class InterpretationNode(BaseNode):
     """Node for interpreting results and generating final responses."""
     
@@ -74,18 +79,22 @@ class InterpretationNode(BaseNode):
                 3.  Include a final conclusion that is under 300 words.
             """
         
-        # Get AI response
-        ai_model = state["ai"]
-        response = ai_model.invoke(prompt_text)
+        # Get AI response, unless an equivalent question was answered on the same data
+        cache_context = f"{search_results}\n{interpretation_prompt or ''}"
+        final_response = _INTERPRETATION_CACHE.get(question, cache_context)
+        if final_response is None:
+            ai_model = state["ai"]
+            final_response = ai_model.invoke(prompt_text).content
+            _INTERPRETATION_CACHE.put(question, cache_context, final_response)
         
         # Log and print response if verbose
         if state.get("verbose", False):
             print("5. ", end="")
         
-        print(response.content)
+        print(final_response)
         
         return {
-            "final_response": response.content
+            "final_response": final_response
         }
 
 
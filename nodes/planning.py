@@ -1,38 +1,200 @@
 """Planning node for analytics planning."""
 
-from typing import Dict, Any
+import asyncio
+import copy
+import json
+import re
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Mapping, Optional, Set, Tuple
 from .base import BaseNode
 from core.state import GraphState
+from schemas.prompts import (
+    PromptTemplates, CHART_PLOTTING_PREFIX, render_chart_plotting_tail,
+    validate_chart, validate_charts
+)
 from utils.decorators import node_with_error_handling
 
 
+_JSON_FENCE = "```json"
+_WHITESPACE = re.compile(r"\s*")
+_CHARTS_ARRAY = re.compile(r'"charts"\s*:\s*\[')
+_ARRAY_SEPARATORS = re.compile(r"[\s,]*")
+_JSON_DECODER = json.JSONDecoder()
+
+# Field order of the positional x/y/filter arrays; must match the CHART_PLOTTING output format
+_CHART_FIELDS = {
+    "x": ("columnID", "name", "type", "format"),
+    "y": ("columnID", "name", "type", "calculation"),
+    "filter": ("columnID", "name", "calculation", "type", "format", "operator", "value")
+}
+
+# Background workers fetching filter options while charts stream in
+_PREFETCH_WORKERS = 4
+
+# Longest string value sent to the LLM per dataset or column field
+_PROMPT_FIELD_LIMIT = 400
+
+# Latin words and CJK runs compared by the relevance gate of the deterministic plan
+_RELEVANCE_TERMS = re.compile(r"[a-z0-9]+|[\u3040-\u30ff\u3400-\u9fff]+")
+_RELEVANCE_STOPWORDS = frozenset({
+    "and", "are", "by", "does", "for", "from", "has", "have", "how", "many", "much",
+    "of", "per", "show", "that", "the", "this", "what", "which", "with"
+})
+
+
+def _expand_chart(chart: Dict[str, Any]) -> Dict[str, Any]:
+    """Expand the compact positional chart format back to keyed entries.
+    
+    Entries already given as objects are passed through unchanged.
+    """
+    return {
+        **chart,
+        **{
+            key: [
+                dict(zip(fields, entry)) if isinstance(entry, list) else entry
+                for entry in chart.get(key, [])
+            ]
+            for key, fields in _CHART_FIELDS.items()
+        }
+    }
+
+
+class _ChartStreamScanner:
+    """Decode chart entries from a streamed response as soon as each is complete.
+    
+    Entries of every ``"charts"`` array are reported in order, including those
+    of drafts the model may revise later, so they only serve as early hints.
+    The plan itself is parsed from the full text once the stream has ended.
+    """
+    
+    def __init__(self):
+        """Initialize scanner."""
+        self.text = ""
+        self._pos: Optional[int] = None
+        self._search_from = 0
+    
+    def feed(self, text: str) -> List[Any]:
+        """Append streamed text.
+        
+        Args:
+            text: Next piece of the response
+            
+        Returns:
+            Chart entries completed by this piece
+        """
+        self.text += text
+        charts = []
+        while True:
+            if self._pos is None:
+                match = _CHARTS_ARRAY.search(self.text, self._search_from)
+                if match is None:
+                    return charts
+                self._pos = match.end()
+            
+            pos = _ARRAY_SEPARATORS.match(self.text, self._pos).end()
+            if pos >= len(self.text):
+                return charts
+            if self.text[pos] == "]":
+                self._pos, self._search_from = None, pos + 1
+                continue
+            try:
+                chart, self._pos = _JSON_DECODER.raw_decode(self.text, pos)
+            except json.JSONDecodeError:
+                # Incomplete so far; a malformed entry is reported by the final parse
+                return charts
+            charts.append(chart)
+
+
+def _truncate_for_prompt(value: Any) -> Any:
+    """Copy a metadata value with long strings cut to the prompt field limit."""
+    if isinstance(value, str):
+        return value if len(value) <= _PROMPT_FIELD_LIMIT else value[:_PROMPT_FIELD_LIMIT] + "..."
+    if isinstance(value, dict):
+        return {k: _truncate_for_prompt(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_truncate_for_prompt(v) for v in value]
+    return value
+
+
+def _relevance_terms(text: str) -> Set[str]:
+    """Split text into lowercase words, with CJK runs split into character bigrams."""
+    terms = set()
+    for run in _RELEVANCE_TERMS.findall(text.lower()):
+        if run.isascii():
+            terms.add(run)
+        else:
+            terms.update(run[i:i + 2] for i in range(max(len(run) - 1, 1)))
+    return terms - _RELEVANCE_STOPWORDS
+
+
 class PlanningNode(BaseNode):
     """Node for analytics planning (future implementation)."""
     
     def __init__(self):
         """Initialize planning node."""
         super().__init__("planning")
+        self.plan_counts = {"deterministic": 0, "llm": 0}
     
-    def execute(self, state: GraphState) -> Dict[str, Any]:
-        """Execute analytics planning.
+    def _try_deterministic_plan(self, question: str, datasets: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Build a chart plan without the LLM for trivially plannable inputs.
+        
+        A plan is produced only when there is a single dataset whose columns
+        are exactly one date/datetime column and one integer/float column, and
+        whose name or description shares a term with the question. Search may
+        pass candidates through unfiltered, so that overlap is the only
+        relevance check the dataset gets before charting.
         
         Args:
-            state: Current graph state
+            question: User's question
+            datasets: Dataset metadata keyed by dataset id
             
         Returns:
-            State updates
+            Planned datasets, or None if the LLM should decide
         """
-        import json
-        import re
-        from schemas.prompts import PromptTemplates
+        if len(datasets) != 1:
+            return None
         
-        # Cache format options to avoid repeated calls
-        format_opts = PromptTemplates.get_format_options()
+        dataset = next(iter(datasets.values()))
+        columns = list(dataset.get('columns', {}).values())
+        if len(columns) != 2:
+            return None
+        
+        date_columns = [c for c in columns if c.get("type") in ("date", "datetime")]
+        numeric_columns = [c for c in columns if c.get("type") in ("integer", "float")]
+        if len(date_columns) != 1 or len(numeric_columns) != 1:
+            return None
+        
+        # Column names such as "Date" or "Count" are too generic to show relevance
+        dataset_text = f"{dataset.get('name') or ''} {dataset.get('description') or ''}"
+        if not _relevance_terms(question) & _relevance_terms(dataset_text):
+            return None
+        
+        return [
+            {
+                **{k: v for k, v in dataset.items() if k != 'columns'},
+                "x": [{**date_columns[0], "format": "year_month"}],
+                "y": [{**numeric_columns[0], "calculation": "sum"}],
+                "filter": []
+            }
+        ]
+    
+    def _load_datasets(self, at: Any, search_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Fetch metadata for each searched dataset.
         
-        # Get metadata for each dataset
+        Args:
+            at: AraliaClient instance
+            search_results: Datasets selected by the search node
+            
+        Returns:
+            Dataset metadata keyed by dataset id
+            
+        Raises:
+            RuntimeError: If no metadata could be retrieved
+        """
         datasets = {}
-        for dataset in state['response']:
-            metadata = state["at"].get_dataset_metadata(dataset['id'], dataset['sourceURL'])
+        for dataset in search_results:
+            metadata = at.get_dataset_metadata(dataset['id'], dataset['sourceURL'])
             if metadata:
                 datasets[dataset['id']] = {
                     **dataset,
@@ -42,71 +204,440 @@ class PlanningNode(BaseNode):
         if not datasets:
             raise RuntimeError("Unable to retrieve data from the searched planet, program terminated")
         
-        if state.get('verbose'):
+        return datasets
+    
+    async def _aload_datasets(self, at: Any, search_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Fetch metadata for all searched datasets concurrently.
+        
+        Args:
+            at: AraliaClient instance
+            search_results: Datasets selected by the search node
+            
+        Returns:
+            Dataset metadata keyed by dataset id
+            
+        Raises:
+            RuntimeError: If no metadata could be retrieved
+        """
+        metadata_list = await asyncio.gather(*(
+            at.aget_dataset_metadata(dataset['id'], dataset['sourceURL'])
+            for dataset in search_results
+        ))
+        datasets = {
+            dataset['id']: {**dataset, **metadata}
+            for dataset, metadata in zip(search_results, metadata_list)
+            if metadata
+        }
+        
+        if not datasets:
+            raise RuntimeError("Unable to retrieve data from the searched planet, program terminated")
+        
+        return datasets
+    
+    def _build_prompt(self, ai: Any, question: str, datasets: Dict[str, Any]) -> Any:
+        """Build the chart plotting prompt.
+        
+        Args:
+            ai: LLM instance the prompt will be sent to
+            question: User's question
+            datasets: Dataset metadata keyed by dataset id
+            
+        Returns:
+            Prompt for the LLM
+        """
+        # All datasets go into one prompt; charts are routed back by id
+        slim = _truncate_for_prompt(datasets)
+        
+        # Serialize once in C so rendering only concatenates strings
+        try:
+            datasets_str = orjson.dumps(slim).decode()
+        except TypeError:
+            datasets_str = json.dumps(slim, ensure_ascii=False, default=str)
+
+        return self.build_cacheable_prompt(
+            ai,
+            CHART_PLOTTING_PREFIX,
+            render_chart_plotting_tail(question, datasets_str)
+        )
+    
+    @staticmethod
+    def _message_text(content: Any) -> str:
+        """Flatten LLM message content into plain text.
+        
+        Args:
+            content: Message content, either a string or a list of content blocks
+            
+        Returns:
+            Text content
+        """
+        if isinstance(content, str):
+            return content
+        return "".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+        )
+    
+    @staticmethod
+    def _parse_chart_json(text: str) -> Dict[str, Any]:
+        """Parse the chart plan from the last fenced JSON block holding one.
+        
+        Each block is decoded as JSON rather than cut at the next fence, so a
+        literal ``` inside a string does not end it. Blocks without a
+        ``charts`` key are skipped, and a later plan replaces an earlier one,
+        since the model may follow a draft with a corrected plan.
+        
+        Args:
+            text: LLM response text
+            
+        Returns:
+            Parsed chart plan
+            
+        Raises:
+            ValueError: If the response has no valid chart JSON block
+        """
+        plan, error = None, None
+        fence = text.find(_JSON_FENCE)
+        while fence != -1:
+            start = _WHITESPACE.match(text, fence + len(_JSON_FENCE)).end()
+            try:
+                block, end = _JSON_DECODER.raw_decode(text, start)
+            except json.JSONDecodeError as e:
+                # Only fatal if no later block holds a plan
+                plan, error = None, e
+                fence = text.find(_JSON_FENCE, start)
+                continue
+            if isinstance(block, dict) and "charts" in block:
+                plan, error = block, None
+            fence = text.find(_JSON_FENCE, end)
+        
+        if error is not None:
+            raise ValueError(f"Malformed chart JSON in the AI response: {error}")
+        if plan is None:
+            raise ValueError("No JSON block found in the AI response")
+        
+        return validate_charts(plan)
+    
+    def _resolve_chart(
+        self,
+        chart: Dict[str, Any],
+        datasets: Dict[str, Any],
+        format_opts: Mapping[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Resolve one LLM chart against the dataset metadata.
+        
+        Args:
+            chart: Chart specification from the LLM, in compact or keyed form
+            datasets: Dataset metadata keyed by dataset id
+            format_opts: Available format options
+            
+        Returns:
+            Planned dataset with resolved x, y and filter columns, or None if
+            the chart refers to an unknown dataset
+        """
+        dataset = datasets.get(chart['id'])
+        if dataset is None:
+            return None
+        columns = dataset['columns']
+        chart = _expand_chart(chart)
+        
+        return {
+            **{k: v for k, v in dataset.items() if k != 'columns'},
+            "x": [
+                {
+                    **columns[x['columnID']],
+                    "format": x["format"]
+                    if x["type"] not in ["date", "datetime", "space"]
+                    else x["format"] if (
+                        (x["type"] in ["date", "datetime"] and x["format"] in format_opts["date"]) or
+                        (x["type"] == "space" and x["format"] in format_opts["space"])
+                    )
+                    else x["format"]
+                }
+                for x in chart["x"]
+            ],
+            "y": [
+                {
+                    **columns[y['columnID']],
+                    'calculation': y['calculation']
+                }
+                for y in chart['y'] 
+                if y['type'] in ["integer", "float"] and y['calculation'] in format_opts['calculation']
+            ],
+            "filter": [
+                {
+                    **columns[f['columnID']],
+                    "format": f["format"]
+                    if f["type"] not in ["date", "datetime", "space"]
+                    else f["format"] if (
+                        (f["type"] in ["date", "datetime"] and f["format"] in format_opts["date"]) or
+                        (f["type"] == "space" and f["format"] in format_opts["space"])
+                    )
+                    else f["format"]
+                }
+                for f in chart["filter"]
+            ]
+        }
+    
+    def _plan_charts(
+        self,
+        response_json: Dict[str, Any],
+        datasets: Dict[str, Any],
+        resolve: Optional[Callable[..., Optional[Dict[str, Any]]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Resolve the LLM chart plan against the dataset metadata.
+        
+        Args:
+            response_json: Parsed chart plan from the LLM
+            datasets: Dataset metadata keyed by dataset id
+            resolve: Used instead of :meth:`_resolve_chart`, with the same arguments
+            
+        Returns:
+            Planned datasets with resolved x, y and filter columns
+            
+        Raises:
+            ValueError: If no chart refers to an available dataset
+        """
+        # Cache format options to avoid repeated calls
+        format_opts = PromptTemplates.get_format_options()
+        resolve = resolve or self._resolve_chart
+        
+        # Only datasets kept by the relevance filter may be charted
+        if "relevant_ids" in response_json:
+            datasets = {
+                dataset_id: datasets[dataset_id]
+                for dataset_id in response_json["relevant_ids"]
+                if dataset_id in datasets
+            }
+        
+        # Drop charts for unknown datasets rather than failing the whole attempt
+        planned = [
+            resolved for resolved in (
+                resolve(chart, datasets, format_opts)
+                for chart in response_json["charts"]
+            )
+            if resolved is not None
+        ]
+        if not planned:
+            raise ValueError("AI response contains no charts for the available datasets")
+        return planned
+    
+    def _plan_streamed_charts(self, ai: Any, at: Any, prompt: Any, datasets: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Plan charts from a streamed response, prefetching filter options.
+        
+        Each chart is resolved as soon as it has streamed in, and its filter
+        options are fetched in the background, overlapping the Aralia requests
+        of the filter decision stage with the remaining LLM generation. The
+        plan is still taken from the complete response: only charts of its
+        final block that pass its ``relevant_ids`` are kept, whichever order
+        the keys came in, and prefetches for other charts are discarded.
+        
+        Args:
+            ai: LLM instance
+            at: AraliaClient instance
+            prompt: Chart plotting prompt
+            datasets: Dataset metadata keyed by dataset id
+            
+        Returns:
+            Planned datasets with filter options populated
+            
+        Raises:
+            ValueError: If no chart refers to an available dataset
+        """
+        format_opts = PromptTemplates.get_format_options()
+        scanner = _ChartStreamScanner()
+        prefetched, futures = [], []
+        executor = ThreadPoolExecutor(max_workers=_PREFETCH_WORKERS)
+        
+        def prefetch(chart: Dict[str, Any]) -> Any:
+            if not chart["filter"]:
+                return None
+            return executor.submit(at.get_filter_options, chart['id'], chart['sourceURL'], chart['filter'])
+        
+        def resolve(chart: Dict[str, Any], relevant: Dict[str, Any], format_opts: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+            if chart['id'] not in relevant:
+                return None
+            for i, (candidate, resolved, future) in enumerate(prefetched):
+                if candidate == chart:
+                    del prefetched[i]
+                    break
+            else:
+                resolved = self._resolve_chart(chart, relevant, format_opts)
+                future = prefetch(resolved)
+            if future is not None:
+                futures.append(future)
+            return resolved
+        
+        try:
+            for chunk in ai.stream(prompt):
+                for chart in scanner.feed(self._message_text(chunk.content)):
+                    try:
+                        chart = validate_chart(chart)
+                        resolved = self._resolve_chart(chart, datasets, format_opts)
+                    except Exception:
+                        # Possibly a draft; the final plan reports its own errors
+                        continue
+                    if resolved is not None:
+                        prefetched.append((chart, resolved, prefetch(resolved)))
+            
+            response_json = self._parse_chart_json(scanner.text)
+            planned = self._plan_charts(response_json, datasets, resolve)
+            for future in futures:
+                future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return planned
+    
+    def _deterministic_response(self, question: str, datasets: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return a state update when the plan needs no LLM call.
+        
+        Args:
+            question: User's question
+            datasets: Dataset metadata keyed by dataset id
+            
+        Returns:
+            State updates, or None if the LLM should plan
+        """
+        filtered_datasets = self._try_deterministic_plan(question, datasets)
+        if filtered_datasets is not None:
+            self.plan_counts["deterministic"] += 1
+            self.logger.info(f"Planned without LLM (bypass vs. LLM: {self.plan_counts})")
+            return {"response": filtered_datasets}
+        self.plan_counts["llm"] += 1
+        return None
+    
+    def execute(self, state: GraphState) -> Dict[str, Any]:
+        """Execute analytics planning.
+        
+        Args:
+            state: Current graph state
+            
+        Returns:
+            State updates
+        """
+        ai, question, at, verbose = state["ai"], state["question"], state["at"], state.get("verbose", False)
+        
+        datasets = self._load_datasets(at, state['response'])
+        
+        if verbose:
             print("3. I am carefully analyzing which data to obtain for chart plotting, please wait a moment.\n")
 
-        plot_chart_prompt = PromptTemplates.CHART_PLOTTING.invoke({
-            "question": state["question"], 
-            "datasets": datasets,
-            "admin_level": PromptTemplates.get_admin_levels()
-        })
+        deterministic = self._deterministic_response(question, datasets)
+        if deterministic is not None:
+            return deterministic
+
+        plot_chart_prompt = self._build_prompt(ai, question, datasets)
 
         for _ in range(5):
             try:
-                response = state["ai"].invoke(plot_chart_prompt)
-
-                response_json = json.loads(list(re.finditer(
-                    r'```json(.*?)```', response.content, re.DOTALL))[-1].group(1))
-                
-                # Process the response to match expected format
-                filtered_datasets = [
-                    {
-                        **{k: v for k, v in datasets[chart['id']].items() if k != 'columns'},
-                        "x": [
-                            {
-                                **datasets[chart['id']]['columns'][x['columnID']],
-                                "format": x["format"]
-                                if x["type"] not in ["date", "datetime", "space"]
-                                else x["format"] if (
-                                    (x["type"] in ["date", "datetime"] and x["format"] in format_opts["date"]) or
-                                    (x["type"] == "space" and x["format"] in format_opts["space"])
-                                )
-                                else x["format"]
-                            }
-                            for x in chart["x"]
-                        ],
-                        "y": [
-                            {
-                                **datasets[chart['id']]['columns'][y['columnID']],
-                                'calculation': y['calculation']
-                            }
-                            for y in chart['y'] 
-                            if y['type'] in ["integer", "float"] and y['calculation'] in format_opts['calculation']
-                        ],
-                        "filter": [
-                            {
-                                **datasets[chart['id']]['columns'][f['columnID']],
-                                "format": f["format"]
-                                if f["type"] not in ["date", "datetime", "space"]
-                                else f["format"] if (
-                                    (f["type"] in ["date", "datetime"] and f["format"] in format_opts["date"]) or
-                                    (f["type"] == "space" and f["format"] in format_opts["space"])
-                                )
-                                else f["format"]
-                            }
-                            for f in chart["filter"]
-                        ]
-                    }
-                    for chart in response_json["charts"]
-                ]
+                filtered_datasets = self._plan_streamed_charts(ai, at, plot_chart_prompt, datasets)
                 break
             except Exception as e:
-                if state.get('verbose'):
+                if verbose:
                     print(f"Error occurred: {e}")
                 continue
         else:
             raise RuntimeError("AI model failed to generate accurate API calls")
         
-        return {"response": filtered_datasets}
+        return {
+            "response": filtered_datasets,
+            # Tells the filter decision node which datasets already have filter options
+            "filter_options": [
+                {"id": chart["id"], "columns": [f["columnID"] for f in chart["filter"]]}
+                for chart in filtered_datasets
+            ]
+        }
+    
+    async def aexecute(self, state: GraphState) -> Dict[str, Any]:
+        """Execute analytics planning asynchronously.
+        
+        Args:
+            state: Current graph state
+            
+        Returns:
+            State updates
+        """
+        ai, question, at, verbose = state["ai"], state["question"], state["at"], state.get("verbose", False)
+        
+        datasets = await self._aload_datasets(at, state['response'])
+        
+        if verbose:
+            print("3. I am carefully analyzing which data to obtain for chart plotting, please wait a moment.\n")
+
+        deterministic = self._deterministic_response(question, datasets)
+        if deterministic is not None:
+            return deterministic
 
+        plot_chart_prompt = self._build_prompt(ai, question, datasets)
 
+        for _ in range(5):
+            try:
+                response = await ai.ainvoke(plot_chart_prompt)
+                response_json = self._parse_chart_json(self._message_text(response.content))
+                return {"response": self._plan_charts(response_json, datasets)}
+            except Exception as e:
+                if verbose:
+                    print(f"Error occurred: {e}")
+                continue
+        
+        raise RuntimeError("AI model failed to generate accurate API calls")
+    
+    async def aexecute_batch(self, states: List[GraphState], max_inflight: int = 32) -> List[Dict[str, Any]]:
+        """Plan several independent states concurrently.
+        
+        States asking the same question over the same datasets with the same
+        model are planned once and share the result.
+        
+        Args:
+            states: Graph states to plan
+            max_inflight: Maximum number of concurrent plans
+            
+        Returns:
+            State updates in the same order as ``states``
+        """
+        semaphore = asyncio.Semaphore(max_inflight)
+        
+        async def _one(state: GraphState) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.aexecute(state)
+        
+        def _key(state: GraphState) -> Tuple[Any, ...]:
+            return (id(state["ai"]), state["question"], tuple(d['id'] for d in state['response']))
+        
+        keys = [_key(state) for state in states]
+        tasks = {}
+        for key, state in zip(keys, states):
+            if key not in tasks:
+                tasks[key] = asyncio.ensure_future(_one(state))
+        
+        await asyncio.gather(*tasks.values())
+        
+        # Later states get their own copy since downstream nodes mutate the plan
+        results, seen = [], set()
+        for key in keys:
+            result = tasks[key].result()
+            results.append(copy.deepcopy(result) if key in seen else result)
+            seen.add(key)
+        return results
+    
+    def execute_batch(self, states: List[GraphState], max_inflight: int = 32) -> List[Dict[str, Any]]:
+        """Synchronous wrapper around :meth:`aexecute_batch`.
+        
+        The async HTTP clients of the states are bound to the event loop
+        started here, so they are closed before it finishes.
+        
+        Args:
+            states: Graph states to plan
+            max_inflight: Maximum number of concurrent plans
+            
+        Returns:
+            State updates in the same order as ``states``
+        """
+        async def _run() -> List[Dict[str, Any]]:
+            try:
+                return await self.aexecute_batch(states, max_inflight)
+            finally:
+                clients = {id(state["at"]): state["at"] for state in states}
+                await asyncio.gather(*(client.aclose() for client in clients.values()))
+        
+        return asyncio.run(_run())
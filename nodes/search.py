@@ -1,15 +1,26 @@
 """Search node implementation for dataset discovery."""
 
 import textwrap
-from typing import Dict, Any
+import orjson
+from typing import Dict, Any, Type
+from pydantic import BaseModel
 from .base import BaseNode
 from core.state import GraphState
 from tools.aralia import AraliaClient
 from schemas.models import DatasetExtractOutput
-from schemas.prompts import PromptTemplates
+from schemas.prompts import render, render_dataset_extract
+from utils.cache import SemanticCache
 from utils.decorators import node_with_error_handling
 
 
+# Dataset selections shared across requests, keyed by question and candidate datasets
+_EXTRACT_CACHE = SemanticCache("dataset_extract")
+
+# Up to this many candidates are passed straight to planning, whose relevance
+# filter phase selects among them without a separate extraction call
+_DIRECT_PLANNING_LIMIT = 5
+
+
 class SearchNode(BaseNode):
     """Node for searching and filtering relevant datasets."""
     
@@ -39,6 +50,59 @@ class SearchNode(BaseNode):
             
         return True
     
+    def _invoke_structured(self, ai_model: Any, prompt: Any, schema: Type[BaseModel]) -> BaseModel:
+        """Invoke the LLM for structured output, repairing invalid responses.
+        
+        A response that fails schema validation is first sent back with only
+        the raw output and the schema for correction; if that also fails, the
+        full prompt is retried once.
+        
+        Args:
+            ai_model: LLM instance
+            prompt: Prompt to invoke
+            schema: Pydantic model describing the expected output
+            
+        Returns:
+            Parsed structured output
+            
+        Raises:
+            RuntimeError: If no valid output is produced after 2 attempts
+        """
+        structured_llm = ai_model.with_structured_output(schema, include_raw=True)
+        
+        for attempt in range(2):
+            try:
+                result = structured_llm.invoke(prompt)
+            except Exception as e:
+                self.logger.warning(f"LLM extraction attempt {attempt + 1} failed: {str(e)}")
+                continue
+            
+            if result.get("parsed") is not None:
+                self.logger.info(f"Structured output succeeded on {'first call' if attempt == 0 else 'full retry'}")
+                return result["parsed"]
+            
+            self.logger.warning(f"LLM extraction attempt {attempt + 1} failed validation: {result.get('parsing_error')}")
+            if attempt > 0:
+                continue
+            
+            raw = result.get("raw")
+            raw_output = getattr(raw, "tool_calls", None) or getattr(raw, "content", raw)
+            try:
+                repaired = ai_model.with_structured_output(schema).invoke(
+                    render(
+                        "structured_output_repair",
+                        schema=orjson.dumps(schema.model_json_schema()).decode(),
+                        response=raw_output
+                    )
+                )
+                if repaired is not None:
+                    self.logger.info("Structured output succeeded after repair")
+                    return repaired
+            except Exception as e:
+                self.logger.warning(f"Structured output repair failed: {str(e)}")
+        
+        raise RuntimeError("Unable to extract relevant datasets after 2 attempts")
+    
     def execute(self, state: GraphState) -> Dict[str, Any]:
         """Execute dataset search and filtering.
         
@@ -48,10 +112,11 @@ class SearchNode(BaseNode):
         Returns:
             State updates with filtered datasets
         """
-        question = state["question"]
+        ai_model, question, at = state["ai"], state["question"], state.get("at")
+        verbose = state.get("verbose", False)
         
         # Get or create Aralia client
-        aralia_client = state.get("at")
+        aralia_client = at
         if not aralia_client:
             aralia_client = AraliaClient(
                 sso_url=state.get("aralia_sso_url"),
@@ -65,7 +130,7 @@ class SearchNode(BaseNode):
         raw_datasets = aralia_client.search_datasets(question)
         datasets = {item['id']: item for item in raw_datasets}
         
-        if state.get("verbose", False):
+        if verbose:
             print(textwrap.dedent(f"""
                 I received your question: "{question}"
                 
@@ -75,32 +140,27 @@ class SearchNode(BaseNode):
         
         # datasets is already indexed
         
-        # Use LLM to filter relevant datasets
-        extract_prompt = PromptTemplates.DATASET_EXTRACT.invoke({
-            "question": question,
-            "datasets": datasets
-        })
-        
-        # Get structured LLM response
-        ai_model = state["ai"]
-        structured_llm = ai_model.with_structured_output(DatasetExtractOutput)
+        # Use LLM to filter relevant datasets, unless planning can do it in the same call
+        if len(datasets) <= _DIRECT_PLANNING_LIMIT:
+            dataset_keys = list(datasets)
+        else:
+            datasets_str = str(datasets)
+            dataset_keys = _EXTRACT_CACHE.get(question, datasets_str)
+            if dataset_keys is None:
+                extract_prompt = render_dataset_extract(question, datasets_str)
+                
+                # Get structured LLM response
+                response = self._invoke_structured(ai_model, extract_prompt, DatasetExtractOutput)
+                dataset_keys = list(response.dataset_key)
+                _EXTRACT_CACHE.put(question, datasets_str, dataset_keys)
         
-        # Retry logic for LLM extraction
-        for attempt in range(5):
-            try:
-                response = structured_llm.invoke(extract_prompt).dict()
-                filtered_datasets = [
-                    datasets[item] for item in response['dataset_key']
-                    if item in datasets
-                ]
-                break
-            except Exception as e:
-                self.logger.warning(f"LLM extraction attempt {attempt + 1} failed: {str(e)}")
-                if attempt == 4:
-                    raise RuntimeError("Unable to extract relevant datasets after 5 attempts")
-                continue
+        filtered_datasets = [
+            datasets[item] for item in dataset_keys
+            if item in datasets
+        ]
         
-        if state.get("verbose", False):
+        # Candidates passed straight to planning have not been filtered yet
+        if verbose and len(datasets) > _DIRECT_PLANNING_LIMIT:
             dataset_names = [item["name"] for item in filtered_datasets]
             print(textwrap.dedent(f"""
                 2. Filtered out the following datasets most relevant to the question: {dataset_names}.
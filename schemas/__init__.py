@@ -10,7 +10,17 @@ from .models import (
     QueryConfig,
     QueryList
 )
-from .prompts import PromptTemplates
+from .prompts import (
+    PromptTemplates,
+    render,
+    render_dataset_extract,
+    render_chart_plotting_tail,
+    render_query_generation_tail,
+    CHART_PLOTTING_PREFIX,
+    QUERY_GENERATION_PREFIX,
+    validate_chart,
+    validate_charts
+)
 
 __all__ = [
     "DatasetExtractOutput",
@@ -21,5 +31,13 @@ __all__ = [
     "FilterConfig",
     "QueryConfig",
     "QueryList",
-    "PromptTemplates"
+    "PromptTemplates",
+    "render",
+    "render_dataset_extract",
+    "render_chart_plotting_tail",
+    "render_query_generation_tail",
+    "CHART_PLOTTING_PREFIX",
+    "QUERY_GENERATION_PREFIX",
+    "validate_chart",
+    "validate_charts"
 ]
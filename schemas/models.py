@@ -1,18 +1,26 @@
 """Pydantic models for Aralia OpenRAG."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 from typing_extensions import Literal, Annotated
 
 
+# Frozen, extra-ignoring models keep structured-output parsing on pydantic-core's fast path
+_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True, str_strip_whitespace=False, arbitrary_types_allowed=False)
+
+
 class DatasetExtractOutput(BaseModel):
     """Output schema for dataset extraction."""
+    model_config = _MODEL_CONFIG
+
     dataset_key: List[str] = Field(..., description="List of dataset keys to extract")
     dataset_name: List[str] = Field(..., description="List of dataset names")
 
 
 class DatasetSpaceInfo(BaseModel):
     """Information about dataset geographic and language context."""
+    model_config = _MODEL_CONFIG
+
     id: str = Field(..., description="Dataset identifier")
     region: Annotated[Literal["Taiwan", "Japan", "Malaysia", "Singapore", "America"], 
                      "Geographic region where dataset originates"]
@@ -22,11 +30,15 @@ class DatasetSpaceInfo(BaseModel):
 
 class DatasetSpaceInfoList(BaseModel):
     """List of dataset space information."""
+    model_config = _MODEL_CONFIG
+
     datasets: List[DatasetSpaceInfo] = Field(..., description="List of dataset space info")
 
 
 class XAxis(BaseModel):
     """X-axis configuration for data visualization."""
+    model_config = _MODEL_CONFIG
+
     columnID: str = Field(..., description="Column identifier")
     displayName: str = Field(..., description="Human-readable column name")
     type: str = Field(..., description="Data type of the column")
@@ -35,6 +47,8 @@ class XAxis(BaseModel):
 
 class YAxis(BaseModel):
     """Y-axis configuration for data visualization."""
+    model_config = _MODEL_CONFIG
+
     columnID: str = Field(..., description="Column identifier")
     displayName: str = Field(..., description="Human-readable column name")
     calculation: str = Field(..., description="Calculation method (sum, avg, count, etc.)")
@@ -42,6 +56,8 @@ class YAxis(BaseModel):
 
 class FilterConfig(BaseModel):
     """Filter configuration for data queries."""
+    model_config = _MODEL_CONFIG
+
     columnID: str = Field(..., description="Column identifier")
     displayName: str = Field(..., description="Human-readable column name")
     type: str = Field(..., description="Data type of the column")
@@ -52,6 +68,8 @@ class FilterConfig(BaseModel):
 
 class QueryConfig(BaseModel):
     """Complete query configuration for data exploration."""
+    model_config = _MODEL_CONFIG
+
     sourceURL: str = Field(..., description="Data source URL")
     id: str = Field(..., description="Dataset identifier")
     name: str = Field(..., description="Dataset name")
@@ -62,6 +80,8 @@ class QueryConfig(BaseModel):
 
 class QueryList(BaseModel):
     """List of query configurations."""
+    model_config = _MODEL_CONFIG
+
     querys: List[QueryConfig] = Field(..., description="List of query configurations")
 
 
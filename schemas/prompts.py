@@ -1,15 +1,49 @@
 """Prompt templates for Aralia OpenRAG."""
 
-from langchain_core.prompts import PromptTemplate
-from typing import Dict, Any
+import functools
+import re
+import sys
+import textwrap
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
+if TYPE_CHECKING:
+    from langchain_core.prompts import PromptTemplate
 
-class PromptTemplates:
-    """Collection of prompt templates for different nodes."""
+try:
+    import fastjsonschema
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    FASTJSONSCHEMA_AVAILABLE = False
+
+
+_CODE_FENCE = re.compile(r"(```.*?```)", re.DOTALL)
+_BLANK_RUNS = re.compile(r"\n{3,}")
+_INDENT = re.compile(r"^((?:    )+)", re.MULTILINE)
+
+
+def _compress_template(template: str) -> str:
+    """Strip layout whitespace from a template without changing its content.
     
-    # Dataset search and filtering
-    DATASET_EXTRACT = PromptTemplate.from_template(
-        """
+    Dedents the block, strips trailing whitespace, collapses repeated blank
+    lines and shrinks each 4-space indent step to a single space. Fenced
+    code blocks are kept verbatim.
+    
+    Args:
+        template: Raw triple-quoted template text
+        
+    Returns:
+        Compressed template text ending in a single newline
+    """
+    parts = _CODE_FENCE.split(textwrap.dedent(template).strip("\n"))
+    for i in range(0, len(parts), 2):
+        text = "\n".join(line.rstrip() for line in parts[i].split("\n"))
+        text = _BLANK_RUNS.sub("\n\n", text)
+        parts[i] = _INDENT.sub(lambda m: " " * (len(m.group(1)) // 4), text)
+    return "".join(parts) + "\n"
+
+
+# Dataset search and filtering
+_DATASET_EXTRACT_RAW = """
         You are an expert data analyst tasked with filtering datasets based on relevance to a user's question.
         
         **Task**: For the following question, identify and retain only the most directly relevant datasets.
@@ -28,24 +62,42 @@ class PromptTemplates:
         
         Return the dataset keys and names for the most relevant datasets only.
         """
-    )
-    
-    # Chart plotting and analysis planning
-    CHART_PLOTTING = PromptTemplate.from_template(
+
+
+# Repair of structured output that failed schema validation
+_STRUCTURED_OUTPUT_REPAIR_RAW = """
+        The following response was supposed to match a JSON schema but failed validation.
+        
+        **JSON Schema**: {schema}
+        
+        **Response**: {response}
+        
+        Return the same content corrected so that it strictly matches the schema.
+        Do not add, remove, or reinterpret any values beyond what is required to make it valid.
         """
+
+
+# Chart plotting and analysis planning. Static instructions come first and all
+# user-specific fields sit in one tail block so provider prompt caching can
+# reuse the whole prefix across calls.
+_CHART_PLOTTING_PREFIX_RAW = """
         # ROLE AND OBJECTIVE
         You are a senior data analyst expert, skilled in data exploration, correlation analysis, and effective data visualization design.
         
         **Objective**: Based on the user's question, analyze each provided dataset and propose **only one specific chart proposal per relevant dataset** that most effectively answers the question.
 
         # INPUT INFORMATION
-        - **Question:** {question}
-        - **Datasets:** {datasets} (includes dataset descriptions, column names, column types, and metadata)
-        - **Administrative Levels:** {admin_level}
+        The administrative levels of each region are listed in the ADMINISTRATIVE LEVELS section below.
+        The question and datasets (including dataset descriptions, column names, column types, and metadata)
+        are provided in the INPUTS section at the end of this prompt.
 
         # ANALYSIS FRAMEWORK
         Execute the following phases systematically, documenting your thought process for each step:
 
+        ## Phase 0: Relevance Filter
+        - Decide which of the provided datasets can directly help answer the question
+        - Return the retained dataset IDs in the `relevant_ids` array; later phases only consider these datasets
+
         ## Phase 1: Problem Analysis
         **Deep Question Understanding:**
         - Analyze the user's question intent and break it down into components
@@ -70,7 +122,7 @@ class PromptTemplates:
         - Grouping/comparison dimensions
 
         ## Phase 2: Dataset Curation
-        - Retain only the most relevant datasets for answering the question
+        - Among the datasets in `relevant_ids`, retain only the most relevant for answering the question
         - Remove datasets that are indirect, redundant, or tangentially related
         - Prioritize quality over quantity
 
@@ -123,59 +175,46 @@ class PromptTemplates:
         **Important:** Grouping/Comparison Dimensions often appear in both `x` array (for grouping) and `filter` array (for category selection)
 
         # OUTPUT FORMAT
-        Return results in the following JSON structure:
+        Return results in the following JSON structure. To keep the output short, each `x`, `y`
+        and `filter` entry is a positional array whose elements appear exactly in the order shown:
+        
+        - `x`: `[columnID, displayName, type, format]`
+        - `y`: `[columnID, displayName, type, calculation]`
+        - `filter`: `[columnID, name, calculation, type, format, operator, [values]]`
         
         ```json
         {{
+            "relevant_ids": ["dataset_id"],
             "charts": [
                 {{
                     "id": "dataset_id",
                     "name": "dataset_name",
-                    "x": [
-                        {{
-                            "columnID": "column_id",
-                            "name": "field_displayName",
-                            "type": "field_type",
-                            "format": "format_specification"
-                        }}
-                    ],
-                    "y": [
-                        {{
-                            "columnID": "column_id", 
-                            "name": "field_displayName",
-                            "type": "field_type",
-                            "calculation": "aggregate_function"
-                        }}
-                    ],
-                    "filter": [
-                        {{
-                            "columnID": "column_id",
-                            "name": "field_name", 
-                            "calculation": "aggregate_function",
-                            "type": "field_type",
-                            "format": "format_specification",
-                            "operator": "filter_operator",
-                            "value": ["filter_value"]
-                        }}
-                    ]
+                    "x": [["column_id", "field_displayName", "field_type", "format_specification"]],
+                    "y": [["column_id", "field_displayName", "field_type", "aggregate_function"]],
+                    "filter": [["column_id", "field_name", "aggregate_function", "field_type", "format_specification", "filter_operator", ["filter_value"]]]
                 }}
             ]
         }}
         ```
+
+        # ADMINISTRATIVE LEVELS
+        {admin_level}
         """
-    )
-    
-    # Query generation and refinement
-    QUERY_GENERATION = PromptTemplate.from_template(
+
+_CHART_PLOTTING_TAIL_RAW = """
+        # INPUTS
+        Question: {question}
+        Datasets: {datasets}
         """
+
+
+# Query generation and refinement, split like the chart plotting template
+_QUERY_GENERATION_PREFIX_RAW = """
         You are a senior data analyst specializing in statistical data analysis and query optimization.
         
         ## Task
         Generate optimized query configurations based on the user's question and available dataset structures.
-        
-        ## Input
-        - **User Question**: {question}
-        - **Dataset Configurations**: {response}
+        The user question and dataset configurations are provided in the INPUTS section at the end of this prompt.
         
         ## Instructions
         
@@ -202,11 +241,16 @@ class PromptTemplates:
         
         Return the modified configuration with updated `operator` and `value` fields only.
         """
-    )
-    
-    # Interpretation and response generation
-    INTERPRETATION = PromptTemplate.from_template(
+
+_QUERY_GENERATION_TAIL_RAW = """
+        # INPUTS
+        User Question: {question}
+        Dataset Configurations: {response}
         """
+
+
+# Interpretation and response generation
+_INTERPRETATION_RAW = """
         You are an expert data analyst providing insights based on retrieved data.
         
         ## Task
@@ -235,64 +279,263 @@ class PromptTemplates:
         
         Focus on actionable insights and ensure all claims are supported by the provided data.
         """
-    )
+
+
+# Compressed template text by name, built once at import. The chart plotting and
+# query generation prompts are split into a static prefix and a per-request tail.
+_TEMPLATES = {
+    name: _compress_template(template)
+    for name, template in {
+        "dataset_extract": _DATASET_EXTRACT_RAW,
+        "structured_output_repair": _STRUCTURED_OUTPUT_REPAIR_RAW,
+        "chart_plotting_prefix": _CHART_PLOTTING_PREFIX_RAW,
+        "chart_plotting_tail": _CHART_PLOTTING_TAIL_RAW,
+        "query_generation_prefix": _QUERY_GENERATION_PREFIX_RAW,
+        "query_generation_tail": _QUERY_GENERATION_TAIL_RAW,
+        "interpretation": _INTERPRETATION_RAW
+    }.items()
+}
+
+
+def _interned(value: Any) -> Any:
+    """Intern strings so comparisons against these constants can short-circuit on identity."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _interned_table(value: Any) -> Any:
+    """Copy nested dicts and lists with every string interned."""
+    if isinstance(value, dict):
+        return {_interned(k): _interned_table(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_interned_table(v) for v in value]
+    return _interned(value)
+
+
+# Administrative level mappings for different regions, shared by every caller
+_ADMIN_LEVELS = _interned_table({
+    "Taiwan": {
+        "admin_level_2": "國家",
+        "admin_level_4": "直轄市/縣市/六都", 
+        "admin_level_7": "直轄市的區",
+        "admin_level_8": "縣轄市/鄉鎮",
+        "admin_level_9": "村/里",
+        "admin_level_10": "鄰"
+    },
+    "Japan": {
+        "admin_level_2": "Country",
+        "admin_level_4": "Prefecture (To/Dō/Fu/Ken)",
+        "admin_level_5": "Subprefecture (Hokkaido only)",
+        "admin_level_6": "County (Gun - limited function) / City subprefecture (Tokyo)",
+        "admin_level_7": "City / Town / Village",
+        "admin_level_8": "Ward (Ku - in designated cities)",
+        "admin_level_9": "District / Town block (Chō/Machi/Chōme)",
+        "admin_level_10": "Area (Ōaza/Aza) / Block number (Banchi)"
+    },
+    "Malaysia": {
+        "admin_level_2": "Country",
+        "admin_level_4": "State (Negeri) / Federal Territory (Wilayah Persekutuan)",
+        "admin_level_5": "Division (Bahagian - Sabah & Sarawak only)",
+        "admin_level_6": "District (Daerah)",
+        "admin_level_7": "Subdistrict (Daerah Kecil / Mukim)",
+        "admin_level_8": "Mukim / Town (Bandar) / Village (Kampung)"
+    },
+    "Singapore": {
+        "admin_level_2": "Country",
+        "admin_level_6": "District (CDC - Community Development Council)"
+    }
+})
+
+# Available format options for different data types, shared by every caller
+_FORMAT_OPTIONS = _interned_table({
+    "date": [
+        "year", "quarter", "month", "week", "date", "day", "weekday",
+        "year_month", "year_quarter", "year_week", "month_day",
+        "day_hour", "hour", "minute", "second", "hour_minute", "time"
+    ],
+    "space": [
+        "admin_level_2", "admin_level_3", "admin_level_4",
+        "admin_level_5", "admin_level_6", "admin_level_7", 
+        "admin_level_8", "admin_level_9", "admin_level_10"
+    ],
+    "calculation": [
+        "count", "sum", "avg", "min", "max", "distinct_count"
+    ],
+    "operator": [
+        "eq", "lt", "gt", "lte", "gte", "in", "range"
+    ]
+})
+
+@functools.lru_cache(maxsize=None)
+def _build_template(parts: Tuple[str, ...]) -> "PromptTemplate":
+    """Build a PromptTemplate from templates in ``_TEMPLATES``, separated by blank lines."""
+    from langchain_core.prompts import PromptTemplate
+    return PromptTemplate.from_template("\n".join(_TEMPLATES[part] for part in parts))
+
+
+class _LazyTemplate:
+    """Class attribute that builds its PromptTemplate on first access."""
+    
+    def __init__(self, *parts: str):
+        self.parts = parts
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+    
+    def __get__(self, instance: Any, owner: type) -> "PromptTemplate":
+        template = _build_template(self.parts)
+        setattr(owner, self.name, template)
+        return template
+
+
+class PromptTemplates:
+    """Collection of prompt templates for different nodes."""
+    
+    # Dataset search and filtering
+    DATASET_EXTRACT = _LazyTemplate("dataset_extract")
+    
+    # Repair of structured output that failed schema validation
+    STRUCTURED_OUTPUT_REPAIR = _LazyTemplate("structured_output_repair")
+    
+    # Chart plotting and analysis planning
+    CHART_PLOTTING = _LazyTemplate("chart_plotting_prefix", "chart_plotting_tail")
+    
+    # Query generation and refinement
+    QUERY_GENERATION = _LazyTemplate("query_generation_prefix", "query_generation_tail")
+    
+    # Interpretation and response generation
+    INTERPRETATION = _LazyTemplate("interpretation")
     
     @classmethod
     def get_admin_levels(cls) -> Dict[str, Dict[str, str]]:
-        """Get administrative level mappings for different regions."""
-        return {
-            "Taiwan": {
-                "admin_level_2": "國家",
-                "admin_level_4": "直轄市/縣市/六都", 
-                "admin_level_7": "直轄市的區",
-                "admin_level_8": "縣轄市/鄉鎮",
-                "admin_level_9": "村/里",
-                "admin_level_10": "鄰"
-            },
-            "Japan": {
-                "admin_level_2": "Country",
-                "admin_level_4": "Prefecture (To/Dō/Fu/Ken)",
-                "admin_level_5": "Subprefecture (Hokkaido only)",
-                "admin_level_6": "County (Gun - limited function) / City subprefecture (Tokyo)",
-                "admin_level_7": "City / Town / Village",
-                "admin_level_8": "Ward (Ku - in designated cities)",
-                "admin_level_9": "District / Town block (Chō/Machi/Chōme)",
-                "admin_level_10": "Area (Ōaza/Aza) / Block number (Banchi)"
-            },
-            "Malaysia": {
-                "admin_level_2": "Country",
-                "admin_level_4": "State (Negeri) / Federal Territory (Wilayah Persekutuan)",
-                "admin_level_5": "Division (Bahagian - Sabah & Sarawak only)",
-                "admin_level_6": "District (Daerah)",
-                "admin_level_7": "Subdistrict (Daerah Kecil / Mukim)",
-                "admin_level_8": "Mukim / Town (Bandar) / Village (Kampung)"
-            },
-            "Singapore": {
-                "admin_level_2": "Country",
-                "admin_level_6": "District (CDC - Community Development Council)"
-            }
-        }
+        """Get administrative level mappings for different regions.
+        
+        The mapping is a module constant shared by every caller and must not
+        be modified.
+        """
+        return _ADMIN_LEVELS
     
     @classmethod
-    def get_format_options(cls) -> Dict[str, list]:
-        """Get available format options for different data types."""
-        return {
-            "date": [
-                "year", "quarter", "month", "week", "date", "day", "weekday",
-                "year_month", "year_quarter", "year_week", "month_day",
-                "day_hour", "hour", "minute", "second", "hour_minute", "time"
-            ],
-            "space": [
-                "admin_level_2", "admin_level_3", "admin_level_4",
-                "admin_level_5", "admin_level_6", "admin_level_7", 
-                "admin_level_8", "admin_level_9", "admin_level_10"
-            ],
-            "calculation": [
-                "count", "sum", "avg", "min", "max", "distinct_count"
-            ],
-            "operator": [
-                "eq", "lt", "gt", "lte", "gte", "in", "range"
-            ]
-        }
+    def get_format_options(cls) -> Dict[str, List[str]]:
+        """Get available format options for different data types.
+        
+        The mapping is a module constant shared by every caller and must not
+        be modified.
+        """
+        return _FORMAT_OPTIONS
+
+
+def render(name: str, **kwargs: Any) -> str:
+    """Render a named template.
+    
+    Args:
+        name: Template name, e.g. ``"dataset_extract"``
+        **kwargs: Values for the template placeholders
+        
+    Returns:
+        Rendered prompt text
+        
+    Raises:
+        KeyError: If the template or one of its placeholders is unknown
+    """
+    return _TEMPLATES[name].format_map(kwargs)
+
+
+# Static prefixes with brace escapes resolved and admin levels baked in, ready to send verbatim
+CHART_PLOTTING_PREFIX = (_TEMPLATES["chart_plotting_prefix"] + "\n").format_map({"admin_level": str(_ADMIN_LEVELS)})
+QUERY_GENERATION_PREFIX = (_TEMPLATES["query_generation_prefix"] + "\n").format_map({})
+
+
+def render_dataset_extract(question: str, datasets: str) -> str:
+    """Render the dataset extraction prompt."""
+    return render("dataset_extract", question=question, datasets=datasets)
+
+
+def render_chart_plotting_tail(question: str, datasets: str) -> str:
+    """Render the user-specific tail of the chart plotting prompt."""
+    return render("chart_plotting_tail", question=question, datasets=datasets)
+
+
+def render_query_generation_tail(question: str, response: str) -> str:
+    """Render the user-specific tail of the query generation prompt."""
+    return render("query_generation_tail", question=question, response=response)
+
+
+def _entry_schema(length: int, required: Tuple[str, ...]) -> Dict[str, Any]:
+    """Schema for an x/y/filter entry, in positional or keyed form."""
+    return {
+        "anyOf": [
+            {"type": "array", "minItems": length, "maxItems": length},
+            {"type": "object", "required": list(required)}
+        ]
+    }
+
+
+# Expected shape of a single chart in the CHART_PLOTTING output
+_CHART_SCHEMA = {
+    "type": "object",
+    "required": ["id", "x", "y", "filter"],
+    "properties": {
+        "id": {"type": "string"},
+        "x": {"type": "array", "items": _entry_schema(4, ("columnID", "type", "format"))},
+        "y": {"type": "array", "items": _entry_schema(4, ("columnID", "type", "calculation"))},
+        "filter": {"type": "array", "items": _entry_schema(7, ("columnID", "type", "format"))}
+    }
+}
+
+_CHARTS_SCHEMA = {
+    "type": "object",
+    "required": ["charts"],
+    "properties": {
+        "relevant_ids": {"type": "array", "items": {"type": "string"}},
+        "charts": {"type": "array", "items": _CHART_SCHEMA}
+    }
+}
+
+
+def _validate_chart_fallback(chart: Any) -> Any:
+    """Check a chart against ``_CHART_SCHEMA`` without fastjsonschema.
+    
+    Raises:
+        ValueError: If the chart does not match the schema
+    """
+    if not isinstance(chart, dict) or not isinstance(chart.get("id"), str):
+        raise ValueError("Chart must be an object with a string 'id'")
+    for key, entry_schema in (
+        (key, _CHART_SCHEMA["properties"][key]["items"]["anyOf"]) for key in ("x", "y", "filter")
+    ):
+        entries = chart.get(key)
+        if not isinstance(entries, list):
+            raise ValueError(f"Chart '{key}' must be an array")
+        length, required = entry_schema[0]["minItems"], entry_schema[1]["required"]
+        for entry in entries:
+            if isinstance(entry, list):
+                if len(entry) != length:
+                    raise ValueError(f"Chart '{key}' entries must have {length} items")
+            elif not isinstance(entry, dict) or any(field not in entry for field in required):
+                raise ValueError(f"Chart '{key}' entries must include {', '.join(required)}")
+    return chart
+
+
+def _validate_charts_fallback(response: Any) -> Any:
+    """Check a chart plan against ``_CHARTS_SCHEMA`` without fastjsonschema.
+    
+    Raises:
+        ValueError: If the plan does not match the schema
+    """
+    if not isinstance(response, dict) or not isinstance(response.get("charts"), list):
+        raise ValueError("Chart JSON must be an object with a 'charts' array")
+    relevant_ids = response.get("relevant_ids", [])
+    if not isinstance(relevant_ids, list) or not all(isinstance(item, str) for item in relevant_ids):
+        raise ValueError("Chart JSON 'relevant_ids' must be an array of strings")
+    for chart in response["charts"]:
+        _validate_chart_fallback(chart)
+    return response
 
 
+# Compiled once at import; both variants raise ValueError on a mismatch
+if FASTJSONSCHEMA_AVAILABLE:
+    validate_chart = fastjsonschema.compile(_CHART_SCHEMA)
+    validate_charts = fastjsonschema.compile(_CHARTS_SCHEMA)
+else:
+    validate_chart = _validate_chart_fallback
+    validate_charts = _validate_charts_fallback
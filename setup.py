@@ -1,12 +1,16 @@
+from pathlib import Path
+
 from setuptools import setup, find_packages
 
+README = Path(__file__).parent / "README.md"
+
 setup(
     name="aralia_openrag",  # 套件名稱
     version="0.3.0",  # 版本號
     author="BigObject",
     author_email="oscarlee@bigobject.io",
     description="OpenRAG is a framework for building RAG applications with LLMs and data planets.",
-    long_description=open("README.md").read(),
+    long_description=README.read_text(encoding="utf-8") if README.exists() else "",
     long_description_content_type="text/markdown",
     url="https://github.com/oscarlee8787/AraliaOpenRAG",
     packages=find_packages(),
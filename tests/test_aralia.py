@@ -0,0 +1,184 @@
+"""Tests for the Aralia client."""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+import tools.aralia as aralia
+from tools.aralia import AraliaClient
+
+
+@pytest.fixture
+def client():
+    """Client without credentials, so no request is made on creation."""
+    client = AraliaClient()
+    yield client
+    client.close()
+
+
+def test_prepare_chart_data_keeps_columns_with_colliding_labels(client):
+    records = [
+        {"x": [["a"], ["b"]], "values": [1.5, 3]},
+        {"x": [["c"], ["d"]], "values": [2.5, 4]},
+    ]
+    chart = client.prepare_chart_data(records, {
+        "x": [{"displayName": "v"}, {"displayName": "v"}],
+        "y": [{"displayName": "v"}, {"displayName": "w"}],
+    })
+
+    assert list(chart["data"].columns) == ["v", "v_2", "v_3", "w"]
+    assert json.loads(chart["json_data"]) == [
+        {"v": "a", "v_2": "b", "v_3": 1.5, "w": 3},
+        {"v": "c", "v_2": "d", "v_3": 2.5, "w": 4},
+    ]
+
+
+def test_unique_labels_skips_names_already_in_use():
+    assert AraliaClient._unique_labels(["v", "v", "v_2"]) == ["v", "v_3", "v_2"]
+
+
+def test_exploration_requests_at_most_the_configured_rows(monkeypatch):
+    requests_made = []
+    monkeypatch.setattr(AraliaClient, "_make_request", lambda self, method, url, **kwargs: requests_made.append(kwargs) or [])
+    client = AraliaClient(exploration_limit=50)
+
+    client.execute_exploration({"id": "ds1", "sourceURL": "https://source.test"})
+    client.close()
+
+    assert requests_made[0]["params"] == {"start": 0, "pageSize": 50}
+
+
+def test_failed_async_request_is_retried_by_one_layer_only(client, monkeypatch):
+    requests_made = []
+
+    def handler(request):
+        requests_made.append(request.url.path)
+        return httpx.Response(503)
+
+    async def no_sleep(seconds):
+        pass
+
+    async def request():
+        client._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client._async_loop = asyncio.get_running_loop()
+        try:
+            await client._amake_request("GET", "https://source.test/down")
+        finally:
+            await client.aclose()
+
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+    client.token = "tok"
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(request())
+    assert len(requests_made) == 3
+
+
+def test_async_client_of_a_finished_loop_is_closed(client, monkeypatch):
+    clients = []
+
+    class FakeAsyncClient:
+        def __init__(self, **kwargs):
+            self.closed = False
+            clients.append(self)
+
+        async def get(self, url, **kwargs):
+            return httpx.Response(200, json={"data": {"list": [1]}}, request=httpx.Request("GET", url))
+
+        async def aclose(self):
+            self.closed = True
+
+    monkeypatch.setattr(aralia.httpx, "AsyncClient", FakeAsyncClient)
+    client.token = "tok"
+
+    for _ in range(2):
+        assert asyncio.run(client._amake_request("GET", "https://source.test/list")) == [1]
+    assert [async_client.closed for async_client in clients] == [True, False]
+
+
+class FakeTokenResponse:
+    """SSO response stub issuing a numbered token."""
+
+    def __init__(self, number):
+        self.content = json.dumps({"access_token": f"tok{number}", "expires_in": 300}).encode()
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def sso(monkeypatch):
+    """Count SSO token requests instead of sending them."""
+    requests_made = []
+
+    def post(session, url, data=None, **kwargs):
+        requests_made.append(data["client_secret"])
+        return FakeTokenResponse(len(requests_made))
+
+    monkeypatch.setattr(aralia.requests.Session, "post", post)
+    monkeypatch.setattr(aralia, "_TOKEN_CACHE", {})
+    return requests_made
+
+
+def test_token_is_shared_only_between_identical_credentials(sso):
+    first = AraliaClient(sso_url="https://sso.test", client_id="id", client_secret="secret")
+    same = AraliaClient(sso_url="https://sso.test", client_id="id", client_secret="secret")
+    rotated = AraliaClient(sso_url="https://sso.test", client_id="id", client_secret="rotated")
+
+    assert same.token == first.token == "tok1"
+    assert rotated.token == "tok2"
+    assert sso == ["secret", "rotated"]
+    assert not any("secret" in str(key) for key in aralia._TOKEN_CACHE)
+
+
+@pytest.fixture
+def unavailable_server(monkeypatch):
+    """Local server answering every POST request with 503."""
+    requests_made = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            requests_made.append(self.path)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(aralia, "_TOKEN_CACHE", {})
+    monkeypatch.setattr(aralia.Retry, "get_backoff_time", lambda self: 0)
+    yield f"http://127.0.0.1:{server.server_address[1]}", requests_made
+    server.shutdown()
+    server.server_close()
+
+
+def test_authentication_is_retried_by_the_session_only(unavailable_server):
+    sso_url, requests_made = unavailable_server
+
+    with pytest.raises(aralia.requests.HTTPError):
+        AraliaClient(sso_url=sso_url, client_id="id", client_secret="secret")
+
+    # One request plus the session's three retries
+    assert len(requests_made) == 4
+
+
+def test_every_retried_request_takes_a_rate_limit_token(unavailable_server, client):
+    url, requests_made = unavailable_server
+    client.rate_limit = 100
+    client.token = "token"
+    tokens_taken = []
+    client._rate_limiter("127.0.0.1").acquire = lambda: tokens_taken.append(1)
+
+    with pytest.raises(aralia.requests.HTTPError):
+        client._make_request("POST", f"{url}/api/explore", json_data={})
+
+    assert len(requests_made) == 4
+    assert len(tokens_taken) == 4
@@ -0,0 +1,83 @@
+"""Tests for the semantic response cache."""
+
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+
+import utils.cache
+from utils.cache import SemanticCache
+
+
+class FakeModel:
+    """Embedding model stub mapping each question to a fixed unit vector."""
+
+    loads = 0
+
+    def __init__(self, model_name):
+        FakeModel.loads += 1
+        self.model_name = model_name
+
+    def encode(self, question, normalize_embeddings=True):
+        if question == "fail":
+            raise RuntimeError("encode failed")
+        return np.array([1.0, 0.0]) if "sales" in question else np.array([0.0, 1.0])
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    FakeModel.loads = 0
+    monkeypatch.setattr(utils.cache, "SENTENCE_TRANSFORMERS_AVAILABLE", True)
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.SimpleNamespace(SentenceTransformer=FakeModel))
+    return FakeModel
+
+
+def test_semantic_hit(fake_model):
+    cache = SemanticCache("test")
+    cache.put("sales by year", "ctx", "response")
+
+    assert cache.get("yearly sales", "ctx") == "response"
+    assert cache.get("yearly sales", "other ctx") is None
+
+
+def test_encode_failure_falls_back_to_exact_match(fake_model):
+    cache = SemanticCache("test")
+    cache.put("fail", "ctx", "unembedded")
+    cache.put("sales by year", "ctx", "response")
+
+    assert cache.get("fail", "ctx") == "unembedded"
+    # Similarity still maps to the right question when an earlier entry has no embedding
+    assert cache.get("yearly sales", "ctx") == "response"
+
+
+def test_load_failure_falls_back_to_exact_match(monkeypatch):
+    def broken_model(model_name):
+        raise OSError("model unavailable")
+
+    monkeypatch.setattr(utils.cache, "SENTENCE_TRANSFORMERS_AVAILABLE", True)
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.SimpleNamespace(SentenceTransformer=broken_model))
+    cache = SemanticCache("test")
+    cache.put("sales by year", "ctx", "response")
+
+    assert cache.get("sales by year", "ctx") == "response"
+    assert cache.get("yearly sales", "ctx") is None
+
+
+def test_model_is_loaded_once_across_threads(fake_model):
+    cache = SemanticCache("test")
+    threads = [threading.Thread(target=cache.put, args=(f"q{i}", "ctx", i)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fake_model.loads == 1
+
+
+def test_entries_are_separate_per_model(fake_model):
+    first = SemanticCache("test", model_name="model-a")
+    second = SemanticCache("test", model_name="model-b")
+
+    assert first._context_key("ctx") != second._context_key("ctx")
@@ -0,0 +1,13 @@
+"""Tests for the assistant graph."""
+
+from core.config import AraliaConfig
+from core.graph import AraliaAssistantGraph
+
+
+def test_client_takes_the_configured_exploration_limit():
+    graph = AraliaAssistantGraph(AraliaConfig(aralia_client_id=None, aralia_client_secret=None, exploration_limit=50))
+
+    state = graph._prepare_state({"question": "q", "ai": "sk-test"})
+    state["at"].close()
+
+    assert state["at"].exploration_limit == 50
@@ -0,0 +1,191 @@
+"""Tests for chart plan parsing in the planning node."""
+
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from nodes.planning import PlanningNode
+
+
+COLUMNS = {
+    "c1": {"columnID": "c1", "displayName": "Date", "type": "date"},
+    "c2": {"columnID": "c2", "displayName": "Count", "type": "integer"},
+    "c3": {"columnID": "c3", "displayName": "City", "type": "space"},
+}
+
+
+def _chart(dataset_id, x_column="c1", name="n"):
+    return {
+        "id": dataset_id,
+        "name": name,
+        "x": [[x_column, "Date", "date", "year"]],
+        "y": [["c2", "Count", "integer", "sum"]],
+        "filter": [["c3", "City", "count", "space", "admin_level_4", "in", []]],
+    }
+
+
+def _block(plan):
+    return "```json\n" + json.dumps(plan) + "\n```"
+
+
+class FakeAI:
+    """LLM stub streaming a fixed response in small chunks."""
+
+    def __init__(self, text):
+        self.text = text
+
+    def stream(self, prompt):
+        for i in range(0, len(self.text), 7):
+            yield SimpleNamespace(content=self.text[i:i + 7])
+
+    async def ainvoke(self, prompt):
+        return SimpleNamespace(content=self.text)
+
+
+class FakeClient:
+    """Aralia client stub recording filter-option requests."""
+
+    def __init__(self):
+        self.filter_requests = []
+        self.closed = 0
+
+    def get_filter_options(self, dataset_id, source_url, columns):
+        self.filter_requests.append(dataset_id)
+        for column in columns:
+            column["values"] = ["Taipei"]
+
+    async def aget_dataset_metadata(self, dataset_id, source_url):
+        return {"columns": dict(COLUMNS)}
+
+    async def aclose(self):
+        self.closed += 1
+
+
+@pytest.fixture
+def datasets():
+    return {
+        dataset_id: {"id": dataset_id, "name": dataset_id, "sourceURL": "u", "columns": dict(COLUMNS)}
+        for dataset_id in ("ds1", "ds2")
+    }
+
+
+def _plan(text, datasets, client=None):
+    return PlanningNode()._plan_streamed_charts(FakeAI(text), client or FakeClient(), None, datasets)
+
+
+def test_last_json_block_replaces_draft(datasets):
+    text = (
+        "Draft:\n" + _block({"charts": [_chart("ds1", x_column="missing")]}) +
+        "\nCorrected:\n" + _block({"charts": [_chart("ds2")]})
+    )
+
+    planned = _plan(text, datasets)
+
+    assert [chart["id"] for chart in planned] == ["ds2"]
+
+
+def test_block_without_charts_is_skipped(datasets):
+    text = _block({"note": "no plan here"}) + "\n" + _block({"charts": [_chart("ds1")]})
+
+    planned = _plan(text, datasets)
+
+    assert [chart["id"] for chart in planned] == ["ds1"]
+
+
+def test_fence_inside_chart_string_does_not_end_block(datasets):
+    text = _block({"charts": [_chart("ds1", name="uses ``` in its name")]})
+
+    planned = _plan(text, datasets)
+
+    assert [chart["id"] for chart in planned] == ["ds1"]
+
+
+def test_malformed_last_block_is_an_error(datasets):
+    text = _block({"charts": [_chart("ds1")]}) + "\n```json\n{\"charts\": [\n```"
+
+    with pytest.raises(ValueError):
+        _plan(text, datasets)
+
+
+def test_filter_options_are_fetched_for_planned_charts(datasets):
+    client = FakeClient()
+
+    planned = _plan(_block({"charts": [_chart("ds1")]}), datasets, client)
+
+    assert client.filter_requests == ["ds1"]
+    assert planned[0]["filter"][0]["values"] == ["Taipei"]
+
+
+@pytest.mark.parametrize("ids_first", [True, False])
+def test_relevant_ids_apply_wherever_they_appear(datasets, ids_first):
+    charts = [_chart("ds1"), _chart("ds2")]
+    plan = {"relevant_ids": ["ds2"], "charts": charts} if ids_first else {"charts": charts, "relevant_ids": ["ds2"]}
+    text = _block(plan)
+
+    streamed = _plan(text, datasets)
+    parsed = PlanningNode()._plan_charts(PlanningNode._parse_chart_json(text), datasets)
+
+    assert [chart["id"] for chart in streamed] == ["ds2"]
+    assert [chart["id"] for chart in parsed] == ["ds2"]
+    assert streamed[0]["filter"][0]["values"] == ["Taipei"]
+
+
+def test_charts_are_prefetched_while_streaming(datasets):
+    fetched = threading.Event()
+
+    class SignallingClient(FakeClient):
+        def get_filter_options(self, dataset_id, source_url, columns):
+            super().get_filter_options(dataset_id, source_url, columns)
+            fetched.set()
+
+    class TrailingAI(FakeAI):
+        def stream(self, prompt):
+            yield from super().stream(prompt)
+            # The chart was complete before the trailing text, so its fetch has started
+            assert fetched.wait(timeout=5)
+
+    client = SignallingClient()
+    text = _block({"charts": [_chart("ds1")]}) + " trailing text"
+
+    PlanningNode()._plan_streamed_charts(TrailingAI(text), client, None, datasets)
+
+    assert client.filter_requests == ["ds1"]
+
+
+def test_execute_batch_closes_the_async_clients():
+    client = FakeClient()
+    ai = FakeAI(_block({"charts": [_chart("ds1")]}))
+    states = [
+        {"ai": ai, "question": question, "at": client, "response": [{"id": "ds1", "name": "ds1", "sourceURL": "u"}]}
+        for question in ("q1", "q2")
+    ]
+
+    results = PlanningNode().execute_batch(states)
+
+    assert [[chart["id"] for chart in result["response"]] for result in results] == [["ds1"], ["ds1"]]
+    assert client.closed == 1
+
+
+@pytest.mark.parametrize("question, deterministic", [
+    ("Monthly rainfall in Taipei", True),
+    ("台北市的降雨量", True),
+    ("Which stocks rose the most?", False),
+    ("Show population by date", False),
+])
+def test_deterministic_plan_requires_question_overlap(question, deterministic):
+    dataset = {
+        "id": "ds1",
+        "name": "Rainfall",
+        "description": "台北市降雨量",
+        "sourceURL": "u",
+        "columns": {
+            "c1": {"columnID": "c1", "displayName": "Date", "type": "date"},
+            "c2": {"columnID": "c2", "displayName": "Millimetres", "type": "float"},
+        },
+    }
+
+    planned = PlanningNode()._try_deterministic_plan(question, {"ds1": dataset})
+
+    assert (planned is not None) == deterministic
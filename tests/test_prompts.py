@@ -0,0 +1,29 @@
+"""Tests for prompt templates and their shared constants."""
+
+import json
+
+from schemas.prompts import PromptTemplates
+
+
+def test_admin_levels_are_plain_dicts():
+    admin_levels = PromptTemplates.get_admin_levels()
+
+    assert type(admin_levels) is dict
+    assert all(type(levels) is dict for levels in admin_levels.values())
+    assert json.loads(json.dumps(admin_levels)) == admin_levels
+
+
+def test_admin_levels_render_as_dict_text():
+    prompt = PromptTemplates.CHART_PLOTTING.invoke({
+        "question": "q",
+        "datasets": "d",
+        "admin_level": PromptTemplates.get_admin_levels()
+    }).to_string()
+
+    assert "mappingproxy" not in prompt
+    assert "'Taiwan': {" in prompt
+
+
+def test_accessors_return_the_shared_constants():
+    assert PromptTemplates.get_admin_levels() is PromptTemplates.get_admin_levels()
+    assert PromptTemplates.get_format_options() is PromptTemplates.get_format_options()
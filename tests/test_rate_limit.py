@@ -0,0 +1,71 @@
+"""Tests for client-side rate limiting."""
+
+import asyncio
+
+import pytest
+
+import utils.rate_limit as rate_limit
+from utils.rate_limit import TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock that only advances while sleeping."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def asleep(self, seconds):
+        self.sleep(seconds)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limit.time, "sleep", clock.sleep)
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", clock.asleep)
+    return clock
+
+
+def test_bucket_allows_a_burst_then_waits_for_refill(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == []
+
+    bucket.acquire()
+    assert clock.sleeps == [0.5]
+
+
+def test_bucket_refills_up_to_capacity_only(clock):
+    bucket = TokenBucket(rate=2)
+    clock.now = 60
+
+    for _ in range(3):
+        bucket.acquire()
+
+    # Capacity defaults to one second of tokens, so the third request waits
+    assert clock.sleeps == [0.5]
+
+
+def test_async_and_blocking_acquisition_share_the_bucket(clock):
+    bucket = TokenBucket(rate=1)
+
+    bucket.acquire()
+    asyncio.run(bucket.aacquire())
+
+    assert clock.sleeps == [1.0]
+
+
+def test_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
@@ -0,0 +1,92 @@
+"""Tests for the dataset search node."""
+
+import pytest
+
+from nodes.search import SearchNode
+from schemas.models import DatasetExtractOutput
+
+
+class FakeClient:
+    """Aralia client stub returning fixed search results."""
+
+    def __init__(self, count):
+        self.results = [{"id": f"ds{i}", "name": f"dataset {i}"} for i in range(count)]
+
+    def search_datasets(self, question):
+        return self.results
+
+
+def test_unfiltered_candidates_are_not_reported_as_filtered(capsys):
+    result = SearchNode().execute({"ai": None, "question": "q", "at": FakeClient(3), "verbose": True})
+
+    assert [dataset["id"] for dataset in result["response"]] == ["ds0", "ds1", "ds2"]
+    assert "Filtered out" not in capsys.readouterr().out
+
+
+class FakeStructuredLLM:
+    """LLM stub replaying scripted structured-output responses.
+
+    ``include_raw`` calls get the next of ``raw_results``; plain calls, used
+    for repair, get the next of ``repairs``. Every prompt is recorded.
+    """
+
+    def __init__(self, raw_results, repairs=()):
+        self.raw_results = list(raw_results)
+        self.repairs = list(repairs)
+        self.prompts = []
+
+    def with_structured_output(self, schema, include_raw=False):
+        responses = self.raw_results if include_raw else self.repairs
+        llm = self
+
+        class Runnable:
+            def invoke(self, prompt):
+                llm.prompts.append(prompt)
+                response = responses.pop(0)
+                if isinstance(response, Exception):
+                    raise response
+                return response
+
+        return Runnable()
+
+
+class FakeMessage:
+    content = '{"dataset_key": ["ds1"]}'
+
+
+def parse_failure():
+    return {"raw": FakeMessage(), "parsed": None, "parsing_error": ValueError("dataset_name missing")}
+
+
+def test_invalid_structured_output_is_repaired_from_the_raw_response():
+    repaired = DatasetExtractOutput(dataset_key=["ds1"], dataset_name=["dataset 1"])
+    llm = FakeStructuredLLM([parse_failure()], repairs=[repaired])
+
+    assert SearchNode()._invoke_structured(llm, "extract prompt", DatasetExtractOutput) is repaired
+
+    repair_prompt = llm.prompts[1]
+    assert FakeMessage.content in repair_prompt
+    assert '"dataset_name"' in repair_prompt
+    assert "extract prompt" not in repair_prompt
+
+
+def test_failed_repair_falls_back_to_the_full_prompt():
+    parsed = DatasetExtractOutput(dataset_key=["ds1"], dataset_name=["dataset 1"])
+    llm = FakeStructuredLLM(
+        [parse_failure(), {"raw": FakeMessage(), "parsed": parsed, "parsing_error": None}],
+        repairs=[ValueError("still invalid")]
+    )
+
+    assert SearchNode()._invoke_structured(llm, "extract prompt", DatasetExtractOutput) is parsed
+    assert llm.prompts[2] == "extract prompt"
+
+
+def test_second_parse_failure_is_not_repaired_again():
+    llm = FakeStructuredLLM([parse_failure(), parse_failure()], repairs=[None])
+
+    with pytest.raises(RuntimeError):
+        SearchNode()._invoke_structured(llm, "extract prompt", DatasetExtractOutput)
+
+    # First call, one repair, then the full retry
+    assert llm.prompts == ["extract prompt", llm.prompts[1], "extract prompt"]
+    assert llm.repairs == []
@@ -1,12 +1,97 @@
 """Aralia Data Planet client and tools."""
 
+import asyncio
+import copy
+import hashlib
+import importlib.util
+import threading
+import time
+import httpx
+import orjson
 import requests
-import pandas as pd
-from typing import List, Dict, Any, Optional
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import TYPE_CHECKING, Callable, List, Dict, Any, Mapping, Optional, Set, Tuple
+from urllib.parse import urlsplit
 
 from utils.decorators import retry_on_failure
 from utils.logging import get_logger
+from utils.rate_limit import TokenBucket
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Upper bound on concurrent filter-option requests per dataset
+_FILTER_OPTION_WORKERS = 16
+
+# Paging of filter-option requests
+_FILTER_OPTION_PARAMS = {"start": 0, "pageSize": 1000}
+
+# POST payloads are pre-encoded with orjson, so the content type is set explicitly
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# HTTP/2 lets concurrent async requests share one connection; httpx needs the h2 package for it
+H2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# urllib3 only decodes Brotli responses when one of these packages is installed
+BROTLI_AVAILABLE = any(importlib.util.find_spec(name) is not None for name in ("brotli", "brotlicffi"))
+
+# Bearer tokens shared across clients, keyed by (sso_url, client_id, secret digest), with their expiry time
+_TOKEN_CACHE: Dict[Tuple[str, str, str], Tuple[str, float]] = {}
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+# Tokens are treated as expired this many seconds early to avoid using one mid-expiry
+_TOKEN_EXPIRY_MARGIN = 30
+_DEFAULT_TOKEN_LIFETIME = 300
+
+# Search results and dataset metadata shared across clients for a few minutes
+_SEARCH_CACHE: TTLCache = TTLCache(maxsize=256, ttl=300)
+_METADATA_CACHE: TTLCache = TTLCache(maxsize=256, ttl=300)
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+# Column fields dropped from planning metadata
+_COLUMN_EXCLUDE = frozenset(["id", "name", "datasetID", "visible", "ordinalPosition", "sortingSettingID"])
+_VIRTUAL_EXCLUDE = frozenset(["id", "name", "datasetID", "visible", "setting", "sourceType", "language", "country"])
+
+
+def _cache_get(cache: TTLCache, key: Tuple[Any, ...]) -> Any:
+    """Get a copy of a cached value, or None on a miss."""
+    with _RESPONSE_CACHE_LOCK:
+        value = cache.get(key)
+    return copy.deepcopy(value) if value is not None else None
+
+
+def _cache_put(cache: TTLCache, key: Tuple[Any, ...], value: Any) -> None:
+    """Store a copy of a value so later mutation by callers cannot leak into the cache."""
+    value = copy.deepcopy(value)
+    with _RESPONSE_CACHE_LOCK:
+        cache[key] = value
+
+
+class _RateLimitedRetry(Retry):
+    """urllib3 retry policy that waits for a rate-limit token before each retry.
+    
+    urllib3 retries inside the adapter, out of sight of the client's token
+    buckets, so ``acquire`` is called with the host of every retried request.
+    """
+    
+    acquire: Optional[Callable[[str], None]] = None
+    
+    def new(self, **kw: Any) -> "_RateLimitedRetry":
+        retry = super().new(**kw)
+        retry.acquire = self.acquire
+        return retry
+    
+    def increment(self, *args: Any, **kwargs: Any) -> "_RateLimitedRetry":
+        # Raises MaxRetryError once retries are exhausted, so no token is taken then
+        retry = super().increment(*args, **kwargs)
+        pool = kwargs.get("_pool")
+        if self.acquire is not None and pool is not None:
+            self.acquire(pool.host)
+        return retry
 
 
 class AraliaClient:
@@ -21,7 +106,9 @@ class AraliaClient:
         sso_url: Optional[str] = None,
         client_id: Optional[str] = None,
         client_secret: Optional[str] = None,
-        stellar_url: Optional[str] = None
+        stellar_url: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+        exploration_limit: int = 1000
     ):
         """Initialize Aralia client.
         
@@ -30,23 +117,98 @@ class AraliaClient:
             client_id: OAuth client ID
             client_secret: OAuth client secret
             stellar_url: Stellar API base URL
+            rate_limit: Maximum requests per second to each host, or None for
+                no limit
+            exploration_limit: Maximum number of rows an exploration returns;
+                applied by the server, so fewer rows are transferred and decoded
         """
         self.sso_url = sso_url or "https://sso.araliadata.io"
         self.client_id = client_id
         self.client_secret = client_secret
         self.stellar_url = stellar_url or "https://tw-air.araliadata.io"
+        self.rate_limit = rate_limit
+        self.exploration_limit = exploration_limit
         
         self.logger = get_logger("aralia_client")
         self.token: Optional[str] = None
         
-        # Authenticate on initialization
+        # Shared session so requests to the same host reuse keep-alive connections;
+        # transient failures are retried by urllib3 with jittered exponential backoff,
+        # each retry taking a token from the host's rate limiter
+        self._session = requests.Session()
+        retry = _RateLimitedRetry(
+            total=3,
+            backoff_factor=0.5,
+            backoff_jitter=0.25,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST"],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        retry.acquire = self._acquire_retry_token
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers["Accept-Encoding"] = "br, gzip" if BROTLI_AVAILABLE else "gzip, deflate"
+        self._encoding_logged_hosts: Set[str] = set()
+        
+        # Token buckets keyed by host, so each source URL has its own budget
+        self._rate_limiters: Dict[str, TokenBucket] = {}
+        self._rate_limiters_lock = threading.Lock()
+        
+        # Async client, created lazily for the event loop that first uses it
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Authenticate on initialization, reusing another client's token while valid
         if client_id and client_secret:
-            self.token = self._authenticate()
+            self.token = self._cached_token() or self._authenticate()
+            self._session.headers["Authorization"] = f"Bearer {self.token}"
+    
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self._session.close()
+    
+    async def aclose(self) -> None:
+        """Close the async HTTP client and its pooled connections."""
+        if self._async_client is not None:
+            client, loop = self._async_client, self._async_loop
+            self._async_client = None
+            self._async_loop = None
+            if loop is asyncio.get_running_loop():
+                await client.aclose()
+            else:
+                await self._aclose_stale_client(client, loop)
+    
+    def __del__(self):
+        session = getattr(self, "_session", None)
+        if session is not None:
+            session.close()
+    
+    def _token_cache_key(self) -> Tuple[str, str, str]:
+        """Key of these credentials in the shared token cache.
+        
+        The secret is part of the key, so a client with a wrong or rotated
+        secret never reuses another client's token; only its digest is kept.
+        """
+        secret_digest = hashlib.sha256((self.client_secret or "").encode("utf-8")).hexdigest()
+        return (self.sso_url, self.client_id, secret_digest)
+    
+    def _cached_token(self) -> Optional[str]:
+        """Get an unexpired token for these credentials from the shared cache."""
+        with _TOKEN_CACHE_LOCK:
+            cached = _TOKEN_CACHE.get(self._token_cache_key())
+        if cached and cached[1] > time.monotonic():
+            self.logger.info("Reusing cached Aralia SSO token")
+            return cached[0]
+        return None
     
-    @retry_on_failure(max_retries=3, delay=1.0)
     def _authenticate(self) -> str:
         """Authenticate with Aralia SSO service.
         
+        Transient errors are retried by the session's retry policy. The new
+        token is stored in the shared token cache.
+        
         Returns:
             Access token
             
@@ -55,9 +217,10 @@ class AraliaClient:
         """
         self.logger.info("Authenticating with Aralia SSO")
         
-        response = requests.post(
+        response = self._session.post(
             f"{self.sso_url.rstrip('/')}/realms/stellar/protocol/openid-connect/token",
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            # Never send a previous bearer token to the SSO endpoint
+            headers={"Content-Type": "application/x-www-form-urlencoded", "Authorization": None},
             data={
                 "grant_type": "client_credentials",
                 "client_id": self.client_id,
@@ -67,11 +230,17 @@ class AraliaClient:
         )
         response.raise_for_status()
         
-        token = response.json()["access_token"]
+        body = orjson.loads(response.content)
+        token = body["access_token"]
+        lifetime = body.get("expires_in") or _DEFAULT_TOKEN_LIFETIME
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE[self._token_cache_key()] = (
+                token, time.monotonic() + lifetime - _TOKEN_EXPIRY_MARGIN
+            )
+        
         self.logger.info("Successfully authenticated with Aralia SSO")
         return token
     
-    @retry_on_failure(max_retries=2, delay=1.0)
     def _make_request(
         self,
         method: str,
@@ -81,10 +250,13 @@ class AraliaClient:
     ) -> Dict[str, Any]:
         """Make authenticated request to Aralia API.
         
+        Transient errors are retried by the session's retry policy; an
+        expired token is refreshed once.
+        
         Args:
             method: HTTP method (GET, POST)
             url: Request URL
-            params: Query parameters for GET requests
+            params: Query parameters
             json_data: JSON payload for POST requests
             
         Returns:
@@ -95,39 +267,146 @@ class AraliaClient:
         """
         if not self.token:
             raise ValueError("Not authenticated. Please provide valid credentials.")
-            
-        headers = {"Authorization": f"Bearer {self.token}"}
         
-        # Try request, re-authenticate once if it fails
+        if method.upper() not in ("GET", "POST"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
+        # Encode the payload once with orjson rather than per attempt with json
+        body = orjson.dumps(json_data) if json_data is not None else None
+        headers = _JSON_HEADERS if body is not None else None
+        
+        limiter = self._rate_limiter(urlsplit(url).hostname)
         for attempt in range(2):
-            try:
-                if method.upper() == "GET":
-                    response = requests.get(url, headers=headers, params=params, timeout=30)
-                elif method.upper() == "POST":
-                    response = requests.post(url, headers=headers, json=json_data, timeout=30)
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-                
-                if response.status_code == 200:
-                    break
-                elif response.status_code == 401 and attempt == 0:
-                    # Token might be expired, try to re-authenticate
-                    self.logger.warning("Token expired, re-authenticating")
-                    self.token = self._authenticate()
-                    headers["Authorization"] = f"Bearer {self.token}"
-                    continue
-                else:
-                    response.raise_for_status()
-                    
-            except requests.RequestException as e:
-                if attempt == 0:
-                    self.logger.warning(f"Request failed, retrying: {str(e)}")
-                    continue
-                raise
-        
-        data = response.json().get("data", {})
+            if limiter is not None:
+                limiter.acquire()
+            response = self._session.request(method.upper(), url, params=params, data=body, headers=headers, timeout=30)
+            if response.status_code == 401 and attempt == 0:
+                # Token might be expired, try to re-authenticate
+                self.logger.warning("Token expired, re-authenticating")
+                self.token = self._authenticate()
+                self._session.headers["Authorization"] = f"Bearer {self.token}"
+                continue
+            break
+        
+        response.raise_for_status()
+        self._log_content_encoding(url, response.headers)
+        return self._response_data(orjson.loads(response.content))
+    
+    def _rate_limiter(self, host: str) -> Optional[TokenBucket]:
+        """Get the token bucket for a host, if rate limiting is enabled."""
+        if not self.rate_limit:
+            return None
+        with self._rate_limiters_lock:
+            limiter = self._rate_limiters.get(host)
+            if limiter is None:
+                limiter = self._rate_limiters[host] = TokenBucket(self.rate_limit)
+        return limiter
+    
+    def _acquire_retry_token(self, host: str) -> None:
+        """Take a token for a request the session's retry policy is about to resend."""
+        limiter = self._rate_limiter(host)
+        if limiter is not None:
+            limiter.acquire()
+    
+    def _log_content_encoding(self, url: str, headers: Mapping[str, str]) -> None:
+        """Log the response compression once per host."""
+        host = urlsplit(url).netloc
+        if host not in self._encoding_logged_hosts:
+            self._encoding_logged_hosts.add(host)
+            self.logger.debug(f"Responses from {host} use Content-Encoding: {headers.get('Content-Encoding', 'identity')}")
+    
+    @staticmethod
+    def _response_data(body: Dict[str, Any]) -> Any:
+        """Unwrap the ``data`` (or ``data.list``) field of an API response."""
+        data = body.get("data", {})
         return data.get("list", data)
     
+    async def _aget_async_client(self) -> httpx.AsyncClient:
+        """Get the async HTTP client bound to the running event loop.
+        
+        A client from an earlier loop cannot be reused, so it is replaced and
+        closed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            stale, stale_loop = self._async_client, self._async_loop
+            self._async_client = httpx.AsyncClient(
+                http2=H2_AVAILABLE,
+                timeout=30,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30)
+            )
+            self._async_loop = loop
+            if stale is not None:
+                await self._aclose_stale_client(stale, stale_loop)
+        return self._async_client
+    
+    async def _aclose_stale_client(self, client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop) -> None:
+        """Close an async client left over from another event loop."""
+        if loop.is_running():
+            # The loop still runs in another thread and may be using the client
+            return
+        try:
+            await client.aclose()
+        except RuntimeError as e:
+            # Connections opened on a closed loop cannot be shut down from this one
+            self.logger.debug(f"Could not close async client of a finished event loop: {str(e)}")
+    
+    @retry_on_failure(max_retries=2, delay=1.0)
+    async def _amake_request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Make authenticated request to Aralia API asynchronously.
+        
+        Failed requests are retried by ``retry_on_failure``; an expired token
+        is refreshed once.
+        
+        Args:
+            method: HTTP method (GET, POST)
+            url: Request URL
+            params: Query parameters
+            json_data: JSON payload for POST requests
+            
+        Returns:
+            Response data
+            
+        Raises:
+            httpx.HTTPError: If request fails
+        """
+        if not self.token:
+            raise ValueError("Not authenticated. Please provide valid credentials.")
+        
+        if method.upper() not in ("GET", "POST"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        client = await self._aget_async_client()
+        limiter = self._rate_limiter(urlsplit(url).hostname)
+        body = orjson.dumps(json_data) if json_data is not None else None
+        
+        for attempt in range(2):
+            headers = {"Authorization": f"Bearer {self.token}"}
+            if limiter is not None:
+                await limiter.aacquire()
+            if method.upper() == "GET":
+                response = await client.get(url, headers=headers, params=params)
+            else:
+                response = await client.post(
+                    url, headers={**headers, **_JSON_HEADERS}, params=params, content=body
+                )
+            if response.status_code == 401 and attempt == 0:
+                # Token might be expired, try to re-authenticate
+                self.logger.warning("Token expired, re-authenticating")
+                self.token = await asyncio.to_thread(self._authenticate)
+                self._session.headers["Authorization"] = f"Bearer {self.token}"
+                continue
+            break
+        
+        response.raise_for_status()
+        self._log_content_encoding(url, response.headers)
+        return self._response_data(orjson.loads(response.content))
+    
     def search_datasets(self, question: str, page_size: int = 50) -> List[Dict[str, Any]]:
         """Search for datasets matching the given question.
         
@@ -138,6 +417,12 @@ class AraliaClient:
         Returns:
             List of matching datasets
         """
+        cache_key = (self.client_id, self.stellar_url, question, page_size)
+        cached = _cache_get(_SEARCH_CACHE, cache_key)
+        if cached is not None:
+            self.logger.info(f"Using cached search results for: {question}")
+            return cached
+        
         self.logger.info(f"Searching datasets for: {question}")
         
         response = self._make_request(
@@ -151,15 +436,55 @@ class AraliaClient:
         
         # Process response to clean up URLs and remove unnecessary fields
         for item in response:
-            if "sourceType" in item:
-                item.pop("sourceType")
-            if "sourceURL" in item:
-                item['sourceURL'], _, _ = item['sourceURL'].partition('/admin')
+            item.pop("sourceType", None)
+            url = item.get("sourceURL")
+            if url:
+                item["sourceURL"] = url.split("/admin", 1)[0]
         
         self.logger.info(f"Found {len(response)} datasets")
+        _cache_put(_SEARCH_CACHE, cache_key, response)
         return response
     
     
+    def _build_metadata(
+        self,
+        metadata: Dict[str, Any],
+        virtual_vars: Optional[List[Dict[str, Any]]],
+        source_url: str
+    ) -> Dict[str, Any]:
+        """Combine dataset metadata and virtual variables into planning metadata.
+        
+        Args:
+            metadata: Raw dataset metadata
+            virtual_vars: Raw virtual variables, if any
+            source_url: Source URL for the dataset
+            
+        Returns:
+            Dataset metadata with processed columns keyed by column id
+        """
+        processed_columns = {}
+        # The raw responses are freshly decoded and not kept, so strip them in place
+        for column in metadata.get("columns", []):
+            if column["type"] != "undefined" and column.get("visible", True):
+                column_id = column["id"]
+                for key in _COLUMN_EXCLUDE:
+                    column.pop(key, None)
+                column["columnID"] = column_id
+                processed_columns[column_id] = column
+        
+        for var in virtual_vars or []:
+            var_id = var["id"]
+            for key in _VIRTUAL_EXCLUDE:
+                var.pop(key, None)
+            var["columnID"] = var_id
+            processed_columns[var_id] = var
+        
+        return {
+            **metadata,
+            "sourceURL": source_url,
+            "columns": processed_columns
+        }
+    
     def get_dataset_metadata(self, dataset_id: str, source_url: str) -> Optional[Dict[str, Any]]:
         """Get metadata for a specific dataset.
         
@@ -170,6 +495,11 @@ class AraliaClient:
         Returns:
             Dataset metadata or None if not found
         """
+        cache_key = (self.client_id, dataset_id, source_url)
+        cached = _cache_get(_METADATA_CACHE, cache_key)
+        if cached is not None:
+            return cached
+        
         self.logger.info(f"Fetching metadata for dataset: {dataset_id}")
         
         try:
@@ -181,48 +511,96 @@ class AraliaClient:
             if not metadata:
                 return None
             
-            # Process columns
-            cols_exclude = ["id", "name", "datasetID", "visible", "ordinalPosition", "sortingSettingID"]
-            
-            processed_columns = {}
-            for column in metadata.get("columns", []):
-                if column["type"] != "undefined" and column.get("visible", True):
-                    processed_columns[column['id']] = {
-                        "columnID": column["id"],
-                        **{k: v for k, v in column.items() if k not in cols_exclude}
-                    }
-            
             # Get virtual variables if available
+            virtual_vars = None
             try:
                 virtual_vars = self._make_request(
                     "GET",
                     f"{source_url}/api/dataset/{dataset_id}/virtual-variables"
                 )
-                
-                if virtual_vars:
-                    virtual_exclude = ["id", "name", "datasetID", "visible", "setting", "sourceType", "language", "country"]
-                    for var in virtual_vars:
-                        processed_columns[var['id']] = {
-                            "columnID": var["id"],
-                            **{k: v for k, v in var.items() if k not in virtual_exclude}
-                        }
             except Exception as e:
                 self.logger.warning(f"Could not fetch virtual variables: {str(e)}")
             
-            return {
-                **metadata,
-                "sourceURL": source_url,
-                "columns": processed_columns
-            }
+            result = self._build_metadata(metadata, virtual_vars, source_url)
+            _cache_put(_METADATA_CACHE, cache_key, result)
+            return result
             
         except Exception as e:
             self.logger.error(f"Failed to fetch metadata for {dataset_id}: {str(e)}")
             return None
     
+    async def aget_dataset_metadata(self, dataset_id: str, source_url: str) -> Optional[Dict[str, Any]]:
+        """Get metadata for a specific dataset asynchronously.
+        
+        The dataset and its virtual variables are fetched concurrently.
+        
+        Args:
+            dataset_id: Dataset identifier
+            source_url: Source URL for the dataset
+            
+        Returns:
+            Dataset metadata or None if not found
+        """
+        cache_key = (self.client_id, dataset_id, source_url)
+        cached = _cache_get(_METADATA_CACHE, cache_key)
+        if cached is not None:
+            return cached
+        
+        self.logger.info(f"Fetching metadata for dataset: {dataset_id}")
+        
+        metadata, virtual_vars = await asyncio.gather(
+            self._amake_request("GET", f"{source_url}/api/dataset/{dataset_id}"),
+            self._amake_request("GET", f"{source_url}/api/dataset/{dataset_id}/virtual-variables"),
+            return_exceptions=True
+        )
+        
+        if isinstance(metadata, Exception):
+            self.logger.error(f"Failed to fetch metadata for {dataset_id}: {str(metadata)}")
+            return None
+        if not metadata:
+            return None
+        
+        if isinstance(virtual_vars, Exception):
+            self.logger.warning(f"Could not fetch virtual variables: {str(virtual_vars)}")
+            virtual_vars = None
+        
+        try:
+            result = self._build_metadata(metadata, virtual_vars, source_url)
+        except Exception as e:
+            self.logger.error(f"Failed to fetch metadata for {dataset_id}: {str(e)}")
+            return None
+        
+        _cache_put(_METADATA_CACHE, cache_key, result)
+        return result
+    
+    
+    def _fetch_filter_values(self, url: str, filter_column: Dict[str, Any]) -> None:
+        """Fetch the available values of one filter column into ``filter_column['values']``.
+        
+        Args:
+            url: Filter-options endpoint of the dataset
+            filter_column: Column configuration to get filters for
+        """
+        try:
+            response = self._make_request(
+                "POST",
+                url,
+                params=_FILTER_OPTION_PARAMS,
+                json_data={"x": [filter_column]}
+            )
+            
+            filter_column['values'] = [item['x'][0][0] for item in response]
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get filter options for column {filter_column.get('columnID', 'unknown')}: {str(e)}")
+            filter_column['values'] = []
     
     def get_filter_options(self, dataset_id: str, source_url: str, filter_columns: List[Dict[str, Any]]) -> None:
         """Get filter options for specified columns.
         
+        Columns are fetched concurrently; a failed column gets an empty
+        value list without affecting the others.
+        
         Args:
             dataset_id: Dataset identifier
             source_url: Source URL for the dataset
@@ -230,19 +608,14 @@ class AraliaClient:
         """
         self.logger.info(f"Fetching filter options for dataset: {dataset_id}")
         
-        for filter_column in filter_columns:
-            try:
-                response = self._make_request(
-                    "POST",
-                    f"{source_url}/api/exploration/{dataset_id}/filter-options?start=0&pageSize=1000",
-                    json_data={"x": [filter_column]}
-                )
-                
-                filter_column['values'] = [item['x'][0][0] for item in response]
-                
-            except Exception as e:
-                self.logger.error(f"Failed to get filter options for column {filter_column.get('columnID', 'unknown')}: {str(e)}")
-                filter_column['values'] = []
+        if not filter_columns:
+            return
+        
+        url = f"{source_url}/api/exploration/{dataset_id}/filter-options"
+        
+        with ThreadPoolExecutor(max_workers=min(_FILTER_OPTION_WORKERS, len(filter_columns))) as executor:
+            for filter_column in filter_columns:
+                executor.submit(self._fetch_filter_values, url, filter_column)
     
     
     def execute_exploration(self, exploration_config: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -262,7 +635,8 @@ class AraliaClient:
         try:
             response = self._make_request(
                 "POST",
-                f"{source_url}/api/exploration/{dataset_id}?start=0&pageSize=1000",
+                f"{source_url}/api/exploration/{dataset_id}",
+                params={"start": 0, "pageSize": self.exploration_limit},
                 json_data=exploration_config
             )
             
@@ -273,12 +647,90 @@ class AraliaClient:
             self.logger.error(f"Exploration failed for {dataset_id}: {str(e)}")
             return []
     
+    @staticmethod
+    def _flatten_exploration(
+        xs: List[List[List[Any]]],
+        values: List[List[Any]],
+        x_labels: Optional[List[str]] = None,
+        value_labels: Optional[List[str]] = None
+    ) -> Tuple[List[str], List[List[Any]]]:
+        """Transpose exploration rows into flattened per-column lists.
+        
+        Each 'x' item contributes its first element. Ragged rows are padded
+        with None up to the widest row.
+        
+        Args:
+            xs: The 'x' list of each row
+            values: The 'values' list of each row
+            x_labels: Custom column names for flattened 'x' values
+            value_labels: Custom column names for flattened 'values'
+            
+        Returns:
+            Column labels and the matching column value lists
+        """
+        x_width = max(map(len, xs), default=0)
+        value_width = max(map(len, values), default=0)
+        
+        if all(len(x) == x_width for x in xs) and all(len(v) == value_width for v in values):
+            columns = (
+                [[x[i][0] for x in xs] for i in range(x_width)] +
+                [[v[i] for v in values] for i in range(value_width)]
+            )
+        else:
+            columns = [[None] * len(xs) for _ in range(x_width + value_width)]
+            for row, (x, v) in enumerate(zip(xs, values)):
+                for i, item in enumerate(x):
+                    columns[i][row] = item[0]
+                for i, value in enumerate(v):
+                    columns[x_width + i][row] = value
+        
+        labels = (
+            (x_labels if x_labels and len(x_labels) == x_width else [f"x{i+1}" for i in range(x_width)]) +
+            (value_labels if value_labels and len(value_labels) == value_width else [f"value{i+1}" for i in range(value_width)])
+        )
+        return labels, columns
+    
+    @staticmethod
+    def _unique_labels(labels: List[str]) -> List[str]:
+        """Suffix repeated labels with _2, _3, ... so every column keeps its own key.
+        
+        Args:
+            labels: Column labels, possibly with duplicates
+            
+        Returns:
+            Labels in the same order, with later duplicates renamed
+        """
+        seen = set(labels)
+        if len(seen) == len(labels):
+            return labels
+        
+        unique, used = [], set()
+        for label in labels:
+            # A renamed label must not take a name another column already has
+            candidate, n = label, 1
+            while candidate in used or (n > 1 and candidate in seen):
+                n += 1
+                candidate = f"{label}_{n}"
+            used.add(candidate)
+            unique.append(candidate)
+        return unique
+    
+    @staticmethod
+    def _columns_to_frame(labels: List[str], columns: List[List[Any]]) -> "pd.DataFrame":
+        """Build a DataFrame in one step from per-column lists."""
+        # pandas is only needed once results are parsed, so keep it off the import path
+        import pandas as pd
+        
+        df = pd.DataFrame(dict(enumerate(columns)))
+        df.columns = labels
+        return df
+    
     def parse_exploration_results(
         self,
-        df: pd.DataFrame,
+        df: "pd.DataFrame",
         x_labels: Optional[List[str]] = None,
         value_labels: Optional[List[str]] = None
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
         """Parse exploration results DataFrame to flatten arrays.
         
         Args:
@@ -289,34 +741,14 @@ class AraliaClient:
         Returns:
             Parsed DataFrame with flattened columns
         """
-        self.logger.info(f"Parsing exploration results with {len(df)} rows")
-        
-        # Initialize lists to store parsed column data
-        x_columns = []
-        value_columns = []
+        if df.empty:
+            import pandas as pd
+            return pd.DataFrame(columns=(x_labels or []) + (value_labels or []))
         
-        # Process each row of the DataFrame
-        for _, row in df.iterrows():
-            # Extract and flatten 'x' values
-            combined_x = [item[0] for item in row['x']]
-            x_columns.append(combined_x)
-            
-            # Add 'values' array directly
-            value_columns.append(row['values'])
-        
-        # Create DataFrames for flattened 'x' and 'values'
-        x_df = pd.DataFrame(
-            x_columns,
-            columns=x_labels if x_labels and len(x_labels) == len(x_columns[0]) else [
-                f"x{i+1}" for i in range(len(x_columns[0]))]
-        )
-        
-        values_df = pd.DataFrame(value_columns)
-        values_df.columns = value_labels if value_labels and len(
-            value_labels) == values_df.shape[1] else [f"value{i+1}" for i in range(values_df.shape[1])]
+        self.logger.info(f"Parsing exploration results with {len(df)} rows")
         
-        # Concatenate the original and parsed DataFrames
-        result_df = pd.concat([x_df, values_df], axis=1)
+        labels, columns = self._flatten_exploration(df['x'].tolist(), df['values'].tolist(), x_labels, value_labels)
+        result_df = self._columns_to_frame(labels, columns)
         
         self.logger.info(f"Parsed data into {len(result_df.columns)} columns")
         return result_df
@@ -344,12 +776,21 @@ class AraliaClient:
             x_cols = [x_axis.get('displayName', f"x{i}") for i, x_axis in enumerate(chart_config.get('x', []))]
             y_cols = [y_axis.get('displayName', f"y{i}") for i, y_axis in enumerate(chart_config.get('y', []))]
             
-            # Convert to DataFrame and parse
-            df = pd.DataFrame(exploration_results)
-            parsed_df = self.parse_exploration_results(df, x_cols, y_cols)
+            # Read the raw records directly, without an intermediate DataFrame
+            labels, columns = self._flatten_exploration(
+                [record['x'] for record in exploration_results],
+                [record['values'] for record in exploration_results],
+                x_cols,
+                y_cols
+            )
+            # Records are keyed by label, so colliding display names must not share a key
+            labels = self._unique_labels(labels)
+            parsed_df = self._columns_to_frame(labels, columns)
             
             # Prepare JSON data (limited to first 400 rows for performance)
-            json_data = parsed_df.head(400).to_json(force_ascii=False, orient='records')
+            json_data = orjson.dumps([
+                dict(zip(labels, row)) for row in zip(*(column[:400] for column in columns))
+            ]).decode()
             
             return {
                 "data": parsed_df,
@@ -2,10 +2,14 @@
 
 from .decorators import node_with_error_handling, retry_on_failure
 from .logging import setup_logging, get_logger
+from .cache import SemanticCache
+from .rate_limit import TokenBucket
 
 __all__ = [
     "node_with_error_handling",
     "retry_on_failure", 
     "setup_logging",
-    "get_logger"
+    "get_logger",
+    "SemanticCache",
+    "TokenBucket"
 ]
@@ -0,0 +1,179 @@
+"""Response caches for LLM calls."""
+
+import hashlib
+import importlib.util
+import re
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from .logging import get_logger
+
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class _Bucket:
+    """Cached entries sharing the same prompt context."""
+
+    __slots__ = ("questions", "embedded_questions", "embeddings", "responses")
+
+    def __init__(self):
+        self.questions: List[str] = []
+        # Questions that have an embedding, aligned with embeddings; encoding can fail for some
+        self.embedded_questions: List[str] = []
+        self.embeddings: List[Any] = []
+        self.responses: Dict[str, Any] = {}
+
+
+class SemanticCache:
+    """Cache of LLM responses keyed by question similarity and prompt context.
+
+    Entries only match within an identical context (e.g. the same datasets)
+    and embedding model, identified by a SHA-1 of both. Within a context, a
+    question hits the cache if it matches a cached question after whitespace
+    and case normalization, or, when ``sentence-transformers`` is installed,
+    if the cosine similarity of their embeddings reaches the threshold. If
+    the model cannot be loaded or fails to encode, only exact matches hit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: float = 0.95,
+        max_entries: int = 10_000,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+    ):
+        """Initialize semantic cache.
+
+        Args:
+            name: Name of the cache for logging
+            threshold: Minimum cosine similarity for a semantic hit
+            max_entries: Maximum number of cached responses
+            model_name: Sentence-transformers model used for embeddings
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.model_name = model_name
+
+        self.logger = get_logger(f"cache.{name}")
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _Bucket] = {}
+        self._order: deque = deque()
+        self._encoder = None
+        self._encoder_lock = threading.Lock()
+        self._encoder_failed = False
+
+    @staticmethod
+    def _normalize(question: str) -> str:
+        return _WHITESPACE.sub(" ", question).strip().casefold()
+
+    def _context_key(self, context: str) -> str:
+        # Vectors from different models are not comparable, so each model gets its own buckets
+        return hashlib.sha1(f"{self.model_name}\0{context}".encode("utf-8")).hexdigest()
+
+    def _get_encoder(self) -> Optional[Any]:
+        """Load the embedding model once, or return None if it cannot be loaded."""
+        if self._encoder is None and not self._encoder_failed:
+            with self._encoder_lock:
+                if self._encoder is None and not self._encoder_failed:
+                    try:
+                        from sentence_transformers import SentenceTransformer
+                        self._encoder = SentenceTransformer(self.model_name)
+                    except Exception as e:
+                        self._encoder_failed = True
+                        self.logger.warning(f"Could not load {self.model_name}, using exact matches only: {str(e)}")
+        return self._encoder
+
+    def _embed(self, question: str) -> Optional[Any]:
+        """Embed a question, or return None when embeddings are unavailable."""
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            return None
+        encoder = self._get_encoder()
+        if encoder is None:
+            return None
+        try:
+            return encoder.encode(question, normalize_embeddings=True)
+        except Exception as e:
+            self.logger.warning(f"Embedding failed, using exact matches only: {str(e)}")
+            return None
+
+    def get(self, question: str, context: str) -> Optional[Any]:
+        """Look up a cached response.
+
+        Args:
+            question: User's question
+            context: Prompt context the response depends on
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        normalized = self._normalize(question)
+        bucket_key = self._context_key(context)
+
+        with self._lock:
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                return None
+            if normalized in bucket.responses:
+                self.logger.info("Cache hit (exact question match)")
+                return bucket.responses[normalized]
+            if not bucket.embeddings:
+                return None
+            questions, embeddings = list(bucket.embedded_questions), list(bucket.embeddings)
+
+        embedding = self._embed(question)
+        if embedding is None:
+            return None
+
+        import numpy as np
+        similarities = np.vstack(embeddings) @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            self.logger.debug(f"Cache miss (best similarity {similarities[best]:.3f})")
+            return None
+
+        with self._lock:
+            bucket = self._buckets.get(bucket_key)
+            response = bucket.responses.get(questions[best]) if bucket else None
+        if response is not None:
+            self.logger.info(f"Cache hit (similarity {similarities[best]:.3f})")
+        return response
+
+    def put(self, question: str, context: str, response: Any) -> None:
+        """Store a response.
+
+        Args:
+            question: User's question
+            context: Prompt context the response depends on
+            response: Response to cache
+        """
+        normalized = self._normalize(question)
+        bucket_key = self._context_key(context)
+        embedding = self._embed(question)
+
+        with self._lock:
+            bucket = self._buckets.setdefault(bucket_key, _Bucket())
+            if normalized in bucket.responses:
+                bucket.responses[normalized] = response
+                return
+
+            bucket.questions.append(normalized)
+            if embedding is not None:
+                bucket.embedded_questions.append(normalized)
+                bucket.embeddings.append(embedding)
+            bucket.responses[normalized] = response
+            self._order.append(bucket_key)
+
+            # Evict the oldest entry, which is always the first in its bucket
+            while len(self._order) > self.max_entries:
+                oldest_key = self._order.popleft()
+                oldest = self._buckets[oldest_key]
+                question = oldest.questions.pop(0)
+                del oldest.responses[question]
+                if oldest.embedded_questions and oldest.embedded_questions[0] == question:
+                    oldest.embedded_questions.pop(0)
+                    oldest.embeddings.pop(0)
+                if not oldest.questions:
+                    del self._buckets[oldest_key]
@@ -1,5 +1,6 @@
 """Custom decorators for LangGraph nodes and tools."""
 
+import asyncio
 import logging
 import time
 from functools import wraps
@@ -18,6 +19,10 @@ except ImportError:
         return decorator
 
 
+# Fields every node expects in the graph state
+_REQUIRED_STATE_FIELDS = ("question", "execution_metadata")
+
+
 def node_with_error_handling(node_name: str, max_retries: int = 3):
     """Standard decorator for LangGraph nodes with error handling and tracing.
     
@@ -35,17 +40,21 @@ def node_with_error_handling(node_name: str, max_retries: int = 3):
         Decorated function
     """
     def decorator(func: Callable[[GraphState], Dict[str, Any]]):
+        logger = logging.getLogger(f"aralia_openrag.nodes.{node_name}")
+        # Exponential backoff between attempts
+        delays = tuple(2 ** attempt for attempt in range(max_retries - 1))
+        
         @wraps(func)
         @traceable(name=f"aralia_node_{node_name}")
         def wrapper(state: GraphState) -> Dict[str, Any]:
-            logger = logging.getLogger(f"aralia_openrag.nodes.{node_name}")
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             # Update execution metadata
             if "execution_metadata" not in state:
                 state["execution_metadata"] = {}
+            meta = state["execution_metadata"]
             
-            state["execution_metadata"]["current_node"] = node_name
+            meta["current_node"] = node_name
             logger.info(f"Starting node: {node_name}")
             
             # Validate state
@@ -59,10 +68,10 @@ def node_with_error_handling(node_name: str, max_retries: int = 3):
             for attempt in range(max_retries):
                 try:
                     result = func(state)
-                    execution_time = time.time() - start_time
+                    execution_time = time.perf_counter() - start_time
                     
                     # Update metadata
-                    completed_nodes = state["execution_metadata"].get("completed_nodes", [])
+                    completed_nodes = meta.setdefault("completed_nodes", [])
                     completed_nodes.append(node_name)
                     
                     result.setdefault("execution_metadata", {}).update({
@@ -78,16 +87,16 @@ def node_with_error_handling(node_name: str, max_retries: int = 3):
                     last_exception = e
                     logger.warning(f"Attempt {attempt + 1} failed for {node_name}: {str(e)}")
                     if attempt < max_retries - 1:
-                        time.sleep(2 ** attempt)  # Exponential backoff
+                        time.sleep(delays[attempt])
                     
             # All retries failed
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             logger.error(f"Node {node_name} failed after {max_retries} attempts: {str(last_exception)}")
             
             return {
                 "errors": [f"{node_name}: {str(last_exception)}"],
                 "execution_metadata": {
-                    "completed_nodes": state["execution_metadata"].get("completed_nodes", []),
+                    "completed_nodes": meta.get("completed_nodes", []),
                     "current_node": None,
                     f"{node_name}_execution_time": execution_time,
                     f"{node_name}_failed": True
@@ -101,6 +110,8 @@ def node_with_error_handling(node_name: str, max_retries: int = 3):
 def retry_on_failure(max_retries: int = 3, delay: float = 1.0, backoff: float = 2.0):
     """Retry decorator for functions that may fail transiently.
     
+    Coroutine functions are retried with non-blocking sleeps.
+    
     Args:
         max_retries: Maximum number of retry attempts
         delay: Initial delay between retries in seconds
@@ -110,10 +121,28 @@ def retry_on_failure(max_retries: int = 3, delay: float = 1.0, backoff: float =
         Decorated function
     """
     def decorator(func: Callable):
+        logger = logging.getLogger(f"aralia_openrag.retry.{func.__name__}")
+        wait_times = tuple(delay * (backoff ** attempt) for attempt in range(max_retries))
+        
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(max_retries + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        if attempt == max_retries:
+                            logger.error(f"Function {func.__name__} failed after {max_retries} retries: {str(e)}")
+                            raise
+                        
+                        wait_time = wait_times[attempt]
+                        logger.warning(f"Attempt {attempt + 1} failed for {func.__name__}: {str(e)}. Retrying in {wait_time:.1f}s")
+                        await asyncio.sleep(wait_time)
+            
+            return async_wrapper
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            logger = logging.getLogger(f"aralia_openrag.retry.{func.__name__}")
-            
             for attempt in range(max_retries + 1):
                 try:
                     return func(*args, **kwargs)
@@ -122,7 +151,7 @@ def retry_on_failure(max_retries: int = 3, delay: float = 1.0, backoff: float =
                         logger.error(f"Function {func.__name__} failed after {max_retries} retries: {str(e)}")
                         raise
                     
-                    wait_time = delay * (backoff ** attempt)
+                    wait_time = wait_times[attempt]
                     logger.warning(f"Attempt {attempt + 1} failed for {func.__name__}: {str(e)}. Retrying in {wait_time:.1f}s")
                     time.sleep(wait_time)
                     
@@ -140,10 +169,10 @@ def validate_node_input(required_fields: list):
         Decorated function
     """
     def decorator(func: Callable[[GraphState], Dict[str, Any]]):
+        logger = logging.getLogger(f"aralia_openrag.validation.{func.__name__}")
+        
         @wraps(func)
         def wrapper(state: GraphState) -> Dict[str, Any]:
-            logger = logging.getLogger(f"aralia_openrag.validation.{func.__name__}")
-            
             missing_fields = [field for field in required_fields if field not in state or state[field] is None]
             
             if missing_fields:
@@ -167,9 +196,7 @@ def _validate_state(state: GraphState, logger: logging.Logger) -> bool:
     Returns:
         True if state is valid, False otherwise
     """
-    required_fields = ["question", "execution_metadata"]
-    
-    for field in required_fields:
+    for field in _REQUIRED_STATE_FIELDS:
         if field not in state:
             logger.error(f"Missing required state field: {field}")
             return False
@@ -4,6 +4,9 @@ import logging
 import sys
 from typing import Optional
 
+# Shared stdout handler, so repeated setup does not attach duplicate handlers
+_STDOUT_HANDLER = logging.StreamHandler(sys.stdout)
+
 
 def setup_logging(
     level: str = "INFO",
@@ -13,10 +16,12 @@ def setup_logging(
     """Setup logging configuration for the application.
     
     Args:
-        level: Logging level (DEBUG, INFO, WARNING, ERROR)
+        level: Logging level (DEBUG, INFO, WARNING, ERROR); unknown names fall back to INFO
         format_string: Custom format string for log messages
         include_timestamp: Whether to include timestamp in log messages
     """
+    log_level = getattr(logging, level.upper(), logging.INFO)
+    
     if format_string is None:
         if include_timestamp:
             format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -24,15 +29,13 @@ def setup_logging(
             format_string = "%(name)s - %(levelname)s - %(message)s"
     
     logging.basicConfig(
-        level=getattr(logging, level.upper()),
+        level=log_level,
         format=format_string,
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=[_STDOUT_HANDLER]
     )
     
     # Set specific loggers
-    logging.getLogger("aralia_openrag").setLevel(getattr(logging, level.upper()))
+    logging.getLogger("aralia_openrag").setLevel(log_level)
     
     # Reduce noise from external libraries
     logging.getLogger("requests").setLevel(logging.WARNING)
@@ -0,0 +1,61 @@
+"""Client-side rate limiting."""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the rate of requests.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``;
+    each request takes one token, waiting for it if the bucket is empty.
+    Both blocking and async acquisition draw from the same bucket.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size; defaults to one second of tokens
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if one is available.
+
+        Returns:
+            0 if a token was taken, otherwise the seconds until one is available
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Take a token, blocking until one is available."""
+        wait = self._take()
+        while wait > 0:
+            time.sleep(wait)
+            wait = self._take()
+
+    async def aacquire(self) -> None:
+        """Take a token, waiting without blocking the event loop."""
+        wait = self._take()
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self._take()